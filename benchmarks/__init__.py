@@ -0,0 +1 @@
+"""파이프라인 성능 측정용 벤치마크 (합성 NEIS 내보내기 파일 생성 + 단계별 시간/메모리 측정)"""
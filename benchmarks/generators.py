@@ -0,0 +1,145 @@
+"""NEIS 내보내기 형식을 흉내 낸 합성 엑셀 파일 생성기 (행특 / 세특 / 창체)
+
+실제 내보내기 파일처럼 제목 행, 띄어 쓴 헤더('행 동 특 성 ...'), 여러 행으로 나뉜 본문,
+병합된 번호/성명/과목 칸(첫 행에만 값이 있어 forward-fill 이 필요함), 페이지마다 반복되는 헤더,
+창체의 2단 헤더와 '희망분야' 행을 포함한다.
+"""
+import io
+import random
+
+import openpyxl
+
+SHORT_PHRASES = [
+    "수업 시간에 적극적으로 참여하며 발표를 주도함",
+    "친구들과 협력하여 모둠 과제를 성실히 수행함",
+    "탐구 보고서를 작성하여 논리적 사고력을 보여줌",
+    "자기주도적 학습 태도가 돋보이며 꾸준히 성장함",
+    "실험 결과를 분석하고 오차의 원인을 설명함",
+    "독서 활동을 통해 진로에 대한 관심을 확장함",
+    "학급 행사에서 맡은 역할을 책임감 있게 완수함",
+    "어려운 개념을 친구들에게 쉽게 설명하여 도움을 줌",
+]
+WORDS = [
+    "관찰", "탐구", "발표", "토론", "보고서", "실험", "자료", "분석", "협력", "성찰", "개념", "문제",
+    "해결", "질문", "의견", "근거", "비교", "정리", "활동", "과정", "결과", "태도", "흥미", "주제",
+]
+SUBJECTS = ["국어", "수학", "영어", "한국사", "통합사회", "통합과학", "과학탐구실험", "정보", "음악", "미술"]
+ROWS_PER_PAGE = 40  # 이 행 수마다 헤더 반복 (인쇄용 내보내기 흉내)
+
+class SentenceSource:
+    """학생 기록 문장 생성기. duplicate_rate 비율만큼 공용 문장 풀에서 가져와 복붙을 흉내 냄"""
+
+    def __init__(self, duplicate_rate=0.1, shared_pool=200, seed=0):
+        self.rng = random.Random(seed)
+        self.duplicate_rate = duplicate_rate
+        self.shared = [self._unique_sentence() for _ in range(shared_pool)] + SHORT_PHRASES
+
+    def _unique_sentence(self):
+        words = self.rng.choices(WORDS, k=self.rng.randint(4, 8))
+        return f"{' '.join(words)} 과정에서 {self.rng.randint(1, 10 ** 6)}번째 아이디어를 제시함"
+
+    def text(self, length):
+        """대략 length 글자의 기록 본문"""
+        sentences = []
+        while sum(len(s) + 2 for s in sentences) < length:
+            if self.rng.random() < self.duplicate_rate:
+                sentences.append(self.rng.choice(self.shared))
+            else:
+                sentences.append(self._unique_sentence())
+        return ". ".join(sentences) + "."
+
+def _chunks(text, size):
+    """본문을 여러 행으로 나눔 (NEIS 는 긴 본문을 여러 행에 걸쳐 내보냄)"""
+    return [text[i:i + size] for i in range(0, len(text), size)] or [text]
+
+def _save(workbook):
+    buffer = io.BytesIO()
+    workbook.save(buffer)
+    return buffer.getvalue()
+
+def hang_workbook(grade, class_no, students, text_length, source, chunk=120):
+    """행동특성 및 종합의견 내보내기"""
+    wb = openpyxl.Workbook()
+    ws = wb.active
+    header = ["번 호", "성 명", "행 동 특 성 및 종 합 의 견"]
+    ws.append(["2024학년도 행동특성 및 종합의견"])
+    ws.append([f"{grade}학년 {class_no}반"])
+    ws.append(header)
+    for number in range(1, students + 1):
+        parts = _chunks(source.text(text_length), chunk)
+        start = ws.max_row + 1
+        for i, part in enumerate(parts):
+            ws.append([number if i == 0 else None, f"학생{number}" if i == 0 else None, part])
+        if len(parts) > 1:
+            ws.merge_cells(start_row=start, start_column=1, end_row=start + len(parts) - 1, end_column=1)
+            ws.merge_cells(start_row=start, start_column=2, end_row=start + len(parts) - 1, end_column=2)
+        if ws.max_row % ROWS_PER_PAGE < len(parts):
+            ws.append(header)
+    return _save(wb)
+
+def kyo_workbook(grade, class_no, students, text_length, source, subjects=3, chunk=120):
+    """교과 세부능력 및 특기사항 내보내기"""
+    wb = openpyxl.Workbook()
+    ws = wb.active
+    header = ["학 기", "과 목", "번 호", "성 명", "세부능력 및 특기사항"]
+    ws.append(["2024학년도 세부능력 및 특기사항"])
+    ws.append([f"{grade}학년 {class_no}반"])
+    ws.append(header)
+    for subject in (SUBJECTS * (subjects // len(SUBJECTS) + 1))[:subjects]:
+        subject_start = ws.max_row + 1
+        for number in range(1, students + 1):
+            parts = _chunks(source.text(text_length), chunk)
+            start = ws.max_row + 1
+            for i, part in enumerate(parts):
+                first = i == 0
+                ws.append([
+                    1 if first and number == 1 else None,
+                    subject if first and number == 1 else None,
+                    number if first else None,
+                    f"학생{number}" if first else None,
+                    part,
+                ])
+            if len(parts) > 1:
+                ws.merge_cells(start_row=start, start_column=3, end_row=start + len(parts) - 1, end_column=3)
+        ws.merge_cells(start_row=subject_start, start_column=2, end_row=ws.max_row, end_column=2)
+    return _save(wb)
+
+def chang_workbook(grade, class_no, students, text_length, source, chunk=120):
+    """창의적 체험활동상황 내보내기 (2단 헤더, 영역별 시간, 희망분야 행)"""
+    wb = openpyxl.Workbook()
+    ws = wb.active
+    ws.append(["2024학년도 창의적 체험활동상황"])
+    ws.append([f"{grade}학년 {class_no}반"])
+    ws.append(["번 호", "성 명", "창 의 적 체 험 활 동 상 황", None, None])
+    ws.append([None, None, "영 역", "시 간", "특 기 사 항"])
+    ws.merge_cells(start_row=3, start_column=3, end_row=3, end_column=5)
+    for number in range(1, students + 1):
+        start = ws.max_row + 1
+        for area, hours in [("자율활동", 20), ("동아리활동", 34), ("진로활동", 17)]:
+            parts = _chunks(source.text(text_length), chunk)
+            if area == "진로활동":
+                ws.append([None, None, area, hours, "희망분야"])
+                parts_rows = [[None, None, None, None, part] for part in parts]
+            else:
+                parts_rows = [[None, None, area if i == 0 else None, hours if i == 0 else None, part]
+                              for i, part in enumerate(parts)]
+            for row in parts_rows:
+                ws.append(row)
+        ws.cell(row=start, column=1, value=number)
+        ws.cell(row=start, column=2, value=f"학생{number}")
+        ws.merge_cells(start_row=start, start_column=1, end_row=ws.max_row, end_column=1)
+    return _save(wb)
+
+def generate_group(classes=4, subjects=3, students=25, text_length=300, duplicate_rate=0.1, grade=2, seed=0,
+                   source=None):
+    """학급마다 행특 / 세특 / 창체 파일을 하나씩 만들어 (파일 이름, 바이트) 목록으로 반환"""
+    source = source or SentenceSource(duplicate_rate=duplicate_rate, seed=seed)
+    files = []
+    for class_no in range(1, classes + 1):
+        files.append((f"{grade}-{class_no}_행특.xlsx", hang_workbook(grade, class_no, students, text_length, source)))
+        files.append((
+            f"{grade}-{class_no}_세특.xlsx",
+            kyo_workbook(grade, class_no, students, text_length, source, subjects=subjects)
+        ))
+        files.append((f"{grade}-{class_no}_창체.xlsx", chang_workbook(grade, class_no, students, text_length, source)))
+    return files
@@ -0,0 +1,152 @@
+"""단계별 벤치마크 실행 및 기준선(JSON) 비교
+
+    python -m benchmarks.run --classes 10 --students 30 --output benchmarks/results/baseline.json
+    python -m benchmarks.run --classes 10 --students 30 --compare benchmarks/results/baseline.json
+
+각 단계(load_rows, parse_excel_streaming, 유형 판정, process_*, parse_files, detect_duplicates, run_cross_validation,
+to_excel_with_style)의 벽시계 시간과 tracemalloc 기준 최대 메모리를 기록한다.
+load_rows / parse_excel_streaming 은 실제 xlsx 파싱 경로(스트리밍 행 읽기)이고,
+detect_layout / process 는 CSV · 예전 xls 처럼 DataFrame 으로 읽는 경로다.
+시간은 메모리 추적 없이 따로 측정하여 tracemalloc 오버헤드가 섞이지 않게 한다.
+"""
+import io
+import sys
+import json
+import time
+import argparse
+import platform
+import warnings
+import subprocess
+import tracemalloc
+
+import pandas as pd
+
+from hakcompare_core import loader, layout, processors, parsing, duplicates, export
+from hakcompare_core.pipeline import combine_parsed
+from benchmarks.generators import SentenceSource, generate_group
+
+def _buffer(file_name, file_bytes):
+    buffer = io.BytesIO(file_bytes)
+    buffer.name = file_name
+    return buffer
+
+def build_stages(group1, group2):
+    """(단계 이름, 인자 없는 함수) 목록. 앞 단계 결과가 필요한 단계는 미리 계산한 입력을 사용"""
+    raw_frames = [loader.load_data(_buffer(name, data)) for name, data in group1]  # DataFrame 경로 단계의 입력
+    detected = [(df, layout.scan_layout(layout.frame_rows(df))[0]) for df in raw_frames]
+    combined1, _ = combine_parsed(parsing.parse_files(group1, max_workers=1))
+    combined2, _ = combine_parsed(parsing.parse_files(group2, max_workers=1))
+    result1, sentences1 = duplicates.analyze_duplicates(combined1.copy())
+    result2, sentences2 = duplicates.analyze_duplicates(combined2.copy())
+
+    return [
+        ('load_rows', lambda: [list(loader.iter_excel_rows(_buffer(name, data))) for name, data in group1]),
+        ('parse_excel_streaming', lambda: [parsing.parse_excel_streaming(_buffer(name, data)) for name, data in group1]),
+        ('detect_layout', lambda: [layout.scan_layout(layout.frame_rows(df)) for df in raw_frames]),
+        ('process', lambda: [processors.process_frame(df, sl.grade_class, sl.file_type, sl) for df, sl in detected if sl.ok]),
+        ('parse_files', lambda: parsing.parse_files(group1, max_workers=1)),
+        ('detect_duplicates', lambda: duplicates.detect_duplicates(combined1.copy())),
+        ('run_cross_validation', lambda: duplicates.run_cross_validation(result1, result2, sentences1, sentences2)),
+        ('to_excel_with_style', lambda: export.to_excel_with_style(result1)),
+    ]
+
+def measure(func, repeat):
+    """(최소 벽시계 시간 초, 최대 메모리 MB)"""
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - start)
+
+    tracemalloc.start()
+    try:
+        func()
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    return min(times), peak / 1e6
+
+def _git_commit():
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def run(args):
+    source = SentenceSource(duplicate_rate=args.duplicate_rate, seed=args.seed)
+    params = dict(
+        classes=args.classes, subjects=args.subjects, students=args.students, text_length=args.text_length,
+        duplicate_rate=args.duplicate_rate
+    )
+    group1 = generate_group(grade=2, source=source, **params)
+    group2 = generate_group(grade=3, source=source, **params)
+
+    stages = {}
+    for name, func in build_stages(group1, group2):
+        wall_time, peak_mb = measure(func, args.repeat)
+        stages[name] = {'wall_time_s': round(wall_time, 4), 'peak_mem_mb': round(peak_mb, 2)}
+        print(f"{name:<22} {wall_time:9.3f}s {peak_mb:10.1f}MB")
+
+    return {
+        'commit': _git_commit(),
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'python': platform.python_version(),
+        'pandas': pd.__version__,
+        'params': dict(params, seed=args.seed, repeat=args.repeat, files_per_group=len(group1)),
+        'stages': stages,
+    }
+
+def compare(result, baseline, tolerance):
+    """기준선 대비 단계별 비율 출력. tolerance 를 넘게 느려진 단계 이름 목록 반환"""
+    if baseline.get('params') != result['params']:
+        print("주의: 기준선과 측정 조건(params)이 다릅니다.", file=sys.stderr)
+
+    regressions = []
+    print(f"\n기준선 {baseline.get('commit')} 대비 (시간 / 메모리 비율)")
+    for name, current in result['stages'].items():
+        before = baseline['stages'].get(name)
+        if before is None:
+            print(f"{name:<22} (기준선 없음)")
+            continue
+        time_ratio = current['wall_time_s'] / before['wall_time_s'] if before['wall_time_s'] else float('inf')
+        mem_ratio = current['peak_mem_mb'] / before['peak_mem_mb'] if before['peak_mem_mb'] else float('inf')
+        flag = ''
+        if time_ratio > 1 + tolerance or mem_ratio > 1 + tolerance:
+            regressions.append(name)
+            flag = '  ← 느려짐'
+        print(f"{name:<22} x{time_ratio:6.2f} / x{mem_ratio:6.2f}{flag}")
+    return regressions
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m benchmarks.run', description='학생부 점검 파이프라인 단계별 벤치마크')
+    parser.add_argument('--classes', type=int, default=4, help='그룹당 학급 수')
+    parser.add_argument('--subjects', type=int, default=3, help='세특 파일당 과목 수')
+    parser.add_argument('--students', type=int, default=25, help='학급당 학생 수')
+    parser.add_argument('--text-length', type=int, default=300, help='기록 하나의 대략적인 글자 수')
+    parser.add_argument('--duplicate-rate', type=float, default=0.1, help='공용 문장(복붙) 비율')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--repeat', type=int, default=3, help='시간 측정 반복 횟수 (최솟값 기록)')
+    parser.add_argument('--output', metavar='JSON', help='측정 결과를 저장할 경로')
+    parser.add_argument('--compare', metavar='JSON', help='비교할 기준선 경로')
+    parser.add_argument('--tolerance', type=float, default=0.2, help='느려짐으로 판단할 비율 (기본 0.2 = 20%%)')
+    args = parser.parse_args(argv)
+
+    warnings.simplefilter('ignore', FutureWarning)
+    result = run(args)
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(result, f, ensure_ascii=False, indent=2)
+        print(f"\n결과 저장: {args.output}")
+
+    if args.compare:
+        with open(args.compare, encoding='utf-8') as f:
+            baseline = json.load(f)
+        if compare(result, baseline, args.tolerance):
+            return 1
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,346 +1,39 @@
 import streamlit as st
 import pandas as pd
-import re
-import io
+import os
+import copy
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+from hakcompare_core import duplicates, export
+from hakcompare_core.archive import ARCHIVE_PATH, SentenceArchive, check_against_archive
+from hakcompare_core.cache import ParseCache, ResultCache, analysis_key
+from hakcompare_core.near_duplicates import NEAR_DUP_THRESHOLD
+from hakcompare_core.similarity import PAIR_THRESHOLD, student_pairs
+from hakcompare_core.parsing import MAX_PARSE_WORKERS
+from hakcompare_core.pipeline import analyze_group
+from hakcompare_core.incremental import cross_validate
+from hakcompare_core.worker import AnalysisJob
+from hakcompare_core.export import style_dataframe, filter_results, page_of
+from hakcompare_core.profiling import RunProfile, PROFILE_LOG_PATH
 
 # -----------------------------------------------------------------------------
-# 1. 공통 유틸리티 함수
+# 1. 핵심 로직 연결 (분석 로직은 hakcompare_core 패키지, 결과는 파일 해시 기반 ResultCache 로 재사용)
 # -----------------------------------------------------------------------------
 
-def load_data(uploaded_file):
-    """파일 로드 (CSV, Excel)"""
-    file_ext = uploaded_file.name.split('.')[-1].lower()
-    try:
-        if file_ext == 'csv':
-            return pd.read_csv(uploaded_file, header=None)
-        elif file_ext in ['xlsx', 'xls']:
-            return pd.read_excel(uploaded_file, header=None, engine='openpyxl')
-        else:
-            return None
-    except Exception as e:
-        st.error(f"파일 오류 ({uploaded_file.name}): {e}")
-        return None
-
-def extract_grade_class(df_raw):
-    """학년 반 추출"""
-    limit = min(20, len(df_raw))
-    for i in range(limit):
-        row_values = df_raw.iloc[i].astype(str).values
-        for val in row_values:
-            match = re.search(r"(\d+)학년\s*(\d+)반", val)
-            if match:
-                return match.group(0)
-    return "미상"
-
-def detect_file_type(df_raw):
-    """파일 유형 감지 (행특 / 세특 / 창체) - 헤더 기반 정확한 판정"""
-    limit = min(20, len(df_raw))
-    
-    # 방법: 실제 헤더 행의 키워드로 판정 (본문 내용 제외)
-    for i in range(limit):
-        row_str = " ".join(df_raw.iloc[i].astype(str).values)
-        
-        # 창체: 헤더에 "영역"과 "시간"/"시수"가 함께 있는 경우
-        if ("영" in row_str and "역" in row_str) and ("시" in row_str and "간" in row_str):
-            return "CHANG"
-        
-        # 행특: 헤더/제목에 "행동특성" 또는 "종합의견"이 있는 경우
-        if "행 동 특 성" in row_str or "행동특성" in row_str or "종합의견" in row_str:
-            return "HANG"
-        
-        # 세특: 헤더에 "과목"과 "세부능력"이 함께 있는 경우  
-        if ("과" in row_str and "목" in row_str) and "세부능력" in row_str:
-            return "KYO"
-    
-    return "UNKNOWN"
-
-
-# -----------------------------------------------------------------------------
-# 2. 데이터 처리 로직 (행특 / 세특 / 창체)
-# -----------------------------------------------------------------------------
-
-def process_hang(df_raw, grade_class):
-    header_idx = -1
-    for i, row in df_raw.iterrows():
-        row_str = row.astype(str).values
-        if any('번' in s and '호' in s for s in row_str) and any('성' in s and '명' in s for s in row_str):
-            header_idx = i
-            break
-            
-    if header_idx == -1: return None
-
-    df = df_raw.iloc[header_idx+1:].copy()
-    df.columns = df_raw.iloc[header_idx].astype(str).str.replace(" ", "")
-    
-    rename_map = {}
-    for col in df.columns:
-        if '번호' in col: rename_map[col] = '번호'
-        elif '행동특성' in col: rename_map[col] = '내용'
-        elif '종합의견' in col: rename_map[col] = '내용'
-    df = df.rename(columns=rename_map)
-    
-    if '번호' not in df.columns or '내용' not in df.columns: return None
-        
-    df['번호'] = pd.to_numeric(df['번호'], errors='coerce')
-    df = df[df['내용'].notna()]
-    df = df[~df['내용'].astype(str).str.contains('행 동 특 성', na=False)]
-    df = df[~df['내용'].astype(str).str.contains('종 합 의 견', na=False)]
-    
-    df['번호'] = df['번호'].ffill()
-    df = df.dropna(subset=['번호'])
-    df['번호'] = df['번호'].astype(int) 
-    
-    df_grouped = df.groupby('번호')['내용'].apply(lambda x: ' '.join(x.astype(str))).reset_index()
-    
-    df_grouped['학년 반'] = grade_class
-    df_grouped['학기'] = ''
-    df_grouped['과목/영역'] = '행동특성'
-    df_grouped['시수'] = ''
-    
-    return df_grouped
-
-def process_kyo(df_raw, grade_class):
-    header_idx = -1
-    for i, row in df_raw.iterrows():
-        row_str = row.astype(str).values
-        if any('과' in s and '목' in s for s in row_str) and any('세부능력' in s for s in row_str):
-            header_idx = i
-            break
-            
-    if header_idx == -1: return None
-        
-    df = df_raw.iloc[header_idx+1:].copy()
-    df.columns = df_raw.iloc[header_idx].astype(str).str.replace(" ", "")
-    
-    rename_map = {}
-    for col in df.columns:
-        if '과목' in col: rename_map[col] = '과목/영역'
-        elif '학기' in col: rename_map[col] = '학기'
-        elif '번호' in col: rename_map[col] = '번호'
-        elif '세부능력' in col: rename_map[col] = '내용'
-        elif '특기사항' in col: rename_map[col] = '내용'
-    df = df.rename(columns=rename_map)
-    
-    if '내용' not in df.columns or '과목/영역' not in df.columns: return None
-
-    df['번호'] = pd.to_numeric(df['번호'], errors='coerce')
-    df = df[df['과목/영역'] != '과 목']
-    df = df[df['과목/영역'] != '과목']
-    df['번호'] = df['번호'].ffill()
-    df['과목/영역'] = df['과목/영역'].ffill()
-    df['학기'] = df['학기'].ffill()
-    
-    df = df.dropna(subset=['번호', '내용'])
-    df['번호'] = df['번호'].astype(int) 
-    
-    df_grouped = df.groupby(['번호', '학기', '과목/영역'])['내용'].apply(lambda x: ' '.join(x.astype(str))).reset_index()
-    
-    df_grouped['학년 반'] = grade_class
-    df_grouped['시수'] = '' 
-    
-    return df_grouped
-
-def process_chang(df_raw, grade_class):
-    header_idx = -1
-    for i, row in df_raw.iterrows():
-        row_str = row.astype(str).values
-        if any('영' in s and '역' in s for s in row_str) and any('시' in s and '간' in s for s in row_str):
-            header_idx = i
-            break
-            
-    if header_idx == -1: return None
-    
-    cols = df_raw.iloc[header_idx].fillna('').astype(str).values.tolist()
-    
-    if header_idx > 0:
-        upper_row = df_raw.iloc[header_idx - 1].fillna('').astype(str).values.tolist()
-        for i in range(len(cols)):
-            if cols[i].strip() == '' or cols[i].lower() == 'nan':
-                if i < len(upper_row) and upper_row[i].strip() != '' and upper_row[i].lower() != 'nan':
-                    cols[i] = upper_row[i]
-    
-    cols = [c.replace(" ", "") for c in cols]
-    
-    df = df_raw.iloc[header_idx+1:].copy()
-    df.columns = cols
-    
-    rename_map = {}
-    for col in df.columns:
-        if '번호' in col: rename_map[col] = '번호'
-        elif '영역' in col: rename_map[col] = '과목/영역'
-        elif '시간' in col: rename_map[col] = '시수'
-        elif '특기사항' in col: rename_map[col] = '내용'
-    
-    df = df.rename(columns=rename_map)
-    
-    if '번호' not in df.columns or '내용' not in df.columns or '과목/영역' not in df.columns:
-        return None
-
-    df['번호'] = pd.to_numeric(df['번호'], errors='coerce')
-    df = df[df['과목/영역'] != '영 역']
-    df = df[df['과목/영역'] != '영역']
-    
-    df['번호'] = df['번호'].ffill()
-    df['과목/영역'] = df['과목/영역'].ffill()
-    df['시수'] = df['시수'].ffill()
-    
-    df = df.dropna(subset=['번호'])
-    df['번호'] = df['번호'].astype(int)
-    
-    df = df[df['내용'].astype(str) != '희망분야']
-    df = df[~df['내용'].astype(str).str.contains('희망분야', na=False)]
-    df = df.dropna(subset=['내용'])
-
-    df_grouped = df.groupby(['번호', '과목/영역', '시수'])['내용'].apply(lambda x: ' '.join(x.astype(str))).reset_index()
-    
-    df_grouped['학년 반'] = grade_class
-    df_grouped['학기'] = '' 
-    
-    return df_grouped
-
-# -----------------------------------------------------------------------------
-# 3. 중복 탐지 및 교차 검증 로직
-# -----------------------------------------------------------------------------
-
-COLOR_PALETTE = [
-    '#ffadad', '#ffd6a5', '#fdffb6', '#caffbf', '#9bf6ff', '#a0c4ff', '#bdb2ff', '#ffc6ff', '#fffffc'
-]
-
-@st.cache_data
-def detect_duplicates(df):
-    if df.empty: return df
-    
-    df['중복여부'] = False
-    df['복붙 의심 문장'] = ''
-    df['색상'] = '' 
-    df['과목/영역'] = df['과목/영역'].fillna('기타')
-    
-    color_idx = 0
-    duplicate_color_map = {}
-    
-    for subject, group in df.groupby(['유형', '과목/영역']):
-        if len(group) < 2: continue
-        
-        sentence_counts = {}
-        for idx, row in group.iterrows():
-            content = str(row['내용'])
-            sentences = [s.strip() for s in re.split(r'[.!?\n]+', content) if len(s.strip()) >= 10]
-            for s in sentences:
-                sentence_counts[s] = sentence_counts.get(s, 0) + 1
-        
-        duplicate_sentences = {s for s, count in sentence_counts.items() if count > 1}
-        
-        for dup_sent in duplicate_sentences:
-            if dup_sent not in duplicate_color_map:
-                duplicate_color_map[dup_sent] = COLOR_PALETTE[color_idx % len(COLOR_PALETTE)]
-                color_idx += 1
-        
-        for idx, row in group.iterrows():
-            content = str(row['내용'])
-            sentences = [s.strip() for s in re.split(r'[.!?\n]+', content) if len(s.strip()) >= 10]
-            found_duplicates = [s for s in sentences if s in duplicate_sentences]
-            
-            if found_duplicates:
-                df.at[idx, '중복여부'] = True
-                unique_dupes = list(set(found_duplicates))
-                df.at[idx, '복붙 의심 문장'] = " / ".join(unique_dupes)
-                df.at[idx, '색상'] = duplicate_color_map[unique_dupes[0]]
-
-    ordered_cols = ['학년 반', '학기', '과목/영역', '번호', '시수', '내용', '복붙 의심 문장', '중복여부', '색상', '유형']
-    final_cols = [c for c in ordered_cols if c in df.columns] 
-    return df[final_cols]
-
-def get_sentence_map(df):
-    """데이터프레임 내의 문장별 사용 내역을 해시맵으로 추출 (교차 검증용)"""
-    sent_map = {}
-    for idx, row in df.iterrows():
-        subj = (row.get('유형', ''), row.get('과목/영역', ''))
-        content = str(row['내용'])
-        grade_class = row['학년 반']
-        num = row['번호']
-        sentences = [s.strip() for s in re.split(r'[.!?\n]+', content) if len(s.strip()) >= 10]
-        for s in sentences:
-            if subj not in sent_map:
-                sent_map[subj] = {}
-            if s not in sent_map[subj]:
-                sent_map[subj][s] = {}
-            if grade_class not in sent_map[subj][s]:
-                sent_map[subj][s][grade_class] = []
-            if num not in sent_map[subj][s][grade_class]:
-                sent_map[subj][s][grade_class].append(num)
-    return sent_map
-
-@st.cache_data
-def run_cross_validation(df1, df2):
-    """그룹1과 그룹2 사이의 동일 유형 데이터 교차 검증"""
-    if df1 is None or df2 is None or df1.empty or df2.empty:
-        return None
-    
-    map1 = get_sentence_map(df1)
-    map2 = get_sentence_map(df2)
-    
-    cross_results = []
-    
-    for subj in set(map1.keys()).intersection(set(map2.keys())):
-        type_val, subject = subj
-        sentences1 = map1[subj]
-        sentences2 = map2[subj]
-        
-        common_sentences = set(sentences1.keys()).intersection(set(sentences2.keys()))
-        
-        for s in common_sentences:
-            g1_usage = []
-            for gc, nums in sentences1[s].items():
-                nums_str = ", ".join([f"{n}번" for n in sorted(nums)])
-                g1_usage.append(f"[{gc}] {nums_str}")
-            g1_str = " \n ".join(g1_usage)
-            
-            g2_usage = []
-            for gc, nums in sentences2[s].items():
-                nums_str = ", ".join([f"{n}번" for n in sorted(nums)])
-                g2_usage.append(f"[{gc}] {nums_str}")
-            g2_str = " \n ".join(g2_usage)
-            
-            cross_results.append({
-                '과목/영역': subject,
-                '복붙 의심 문장': s,
-                '그룹1 파일의 학년 반': g1_str,
-                '그룹 2 파일의 학년 반': g2_str
-            })
-            
-    if cross_results:
-        return pd.DataFrame(cross_results)
-    return None
-
-def style_dataframe(df_to_style):
-    def row_style(row):
-        styles = [''] * len(row)
-        if row.get('중복여부', False) and row.get('색상', '') != '':
-            bg_color = f"background-color: {row['색상']}; color: black;"
-            for target_col in ['과목/영역', '내용', '복붙 의심 문장']:
-                if target_col in row.index:
-                    styles[row.index.get_loc(target_col)] = bg_color
-        return styles
-
-    display_cols = [c for c in df_to_style.columns if c not in ['중복여부', '색상', '유형']]
-    return df_to_style.style.apply(row_style, axis=1), display_cols
-
-@st.cache_data
-def to_excel_with_style(df):
-    output = io.BytesIO()
-    styler, save_cols = style_dataframe(df)
-    
-    with pd.ExcelWriter(output, engine='openpyxl') as writer:
-        styler.to_excel(writer, index=False, columns=save_cols, sheet_name='정리결과')
-        worksheet = writer.sheets['정리결과']
-        for idx, col in enumerate(save_cols):
-            width = 50 if '내용' in col or '문장' in col else 12
-            worksheet.column_dimensions[chr(65 + idx)].width = width
-            
-    return output.getvalue()
+# Streamlit 은 이 스크립트를 __main__ 으로 실행하므로 spawn / forkserver 방식 워커는 UI 코드까지 다시 실행함
+# → fork 가 가능한 환경에서만 프로세스 풀로 병렬 파싱. 여러 스레드가 있는 서버에서 fork 할 때마다 다른 스레드가 잡은
+#   잠금을 물려받아 멈출 수 있으므로, 앱 전체가 함께 쓰는 풀 하나를 한 번만 만들어 (그때 워커를 모두 띄움) 재사용
+PARSE_POOL_CONTEXT = (
+    multiprocessing.get_context('fork') if 'fork' in multiprocessing.get_all_start_methods() else None
+)
+PROGRESS_POLL_SECONDS = 0.5  # 백그라운드 분석 진행 상황을 다시 그리는 간격
+CROSS_UNIT_LABELS = {'group': '업로드 그룹', 'grade': '학년', 'class': '학년 반'}
+FILE_STATUS_LABELS = {'queued': '⏳ 대기', 'parsing': '🔄 파싱 중', 'cached': '♻️ 이전 결과 사용', 'done': '✅ 완료', 'error': '❌ 오류'}
 
 # -----------------------------------------------------------------------------
-# 4. 메인 앱 UI (멀티 파일 업로드 및 탭 구조)
+# 2. 메인 앱 UI (멀티 파일 업로드 및 탭 구조)
 # -----------------------------------------------------------------------------
 st.set_page_config(page_title="학생부 점검 도우미", layout="wide")
 
@@ -352,22 +45,48 @@ st.markdown("""
   1. xlsx_data 파일 업로드 시 **자동 분류 및 정리**
   2. **그룹 내 복붙 의심 문장 색상 표시**
   3. **두 그룹 간의 교차 검증 지원** (다른 파일에 복붙한 사례 색출)
+  4. **여러 학년 · 학년 반을 한 번에 교차 검증** (단위 간 공유 문장 수 표)
 """)
 
 # 두 그룹의 결과 저장을 위한 세션 상태 초기화
 if 'final_df_1' not in st.session_state: st.session_state.final_df_1 = None
 if 'final_df_2' not in st.session_state: st.session_state.final_df_2 = None
+# 분석 시 만든 문장 테이블 (교차 검증에서 재사용)
+if 'sentences_1' not in st.session_state: st.session_state.sentences_1 = None
+if 'sentences_2' not in st.session_state: st.session_state.sentences_2 = None
+# 분석 결과 지문 (파일 해시 + 옵션, 결과 캐시 키)
+if 'result_key_1' not in st.session_state: st.session_state.result_key_1 = None
+if 'result_key_2' not in st.session_state: st.session_state.result_key_2 = None
+# 정확히 같은 문장 모드로 분석한 그룹의 중복 색인 (파일 추가 / 삭제 시 바뀐 파일만 반영)
+if 'dup_index_1' not in st.session_state: st.session_state.dup_index_1 = None
+if 'dup_index_2' not in st.session_state: st.session_state.dup_index_2 = None
+# 마지막 분석 실행의 단계별 측정 기록 (진단 정보 패널에 표시)
+if 'run_profile' not in st.session_state: st.session_state.run_profile = None
+# 백그라운드에서 실행 중인 분석 작업 (세션마다 하나)
+if 'analysis_job' not in st.session_state: st.session_state.analysis_job = None
+# 화면 영역(앱 본문 / 조각)별 마지막 그리기 측정 기록 (조각만 다시 실행되면 그 조각의 기록만 바뀜)
+if 'render_profiles' not in st.session_state: st.session_state.render_profiles = {}
 
 # -----------------------------------------------------------------------------
 # 파일 변경 시 호출될 콜백 함수 추가
 # -----------------------------------------------------------------------------
 def reset_group1():
-    """그룹 1 파일 업로더에 변경(추가/삭제)이 발생하면 그룹1 결과 초기화"""
+    """그룹 1 파일 업로더에 변경(추가/삭제)이 발생하면 그룹1 결과 초기화 (색인이 있으면 다음 실행에서 바뀐 파일만 반영)"""
+    if st.session_state.dup_index_1 is not None:
+        st.session_state.sync_group_1 = True
+        return
     st.session_state.final_df_1 = None
+    st.session_state.sentences_1 = None
+    st.session_state.result_key_1 = None
 
 def reset_group2():
-    """그룹 2 파일 업로더에 변경(추가/삭제)이 발생하면 그룹2 결과 초기화"""
+    """그룹 2 파일 업로더에 변경(추가/삭제)이 발생하면 그룹2 결과 초기화 (색인이 있으면 다음 실행에서 바뀐 파일만 반영)"""
+    if st.session_state.dup_index_2 is not None:
+        st.session_state.sync_group_2 = True
+        return
     st.session_state.final_df_2 = None
+    st.session_state.sentences_2 = None
+    st.session_state.result_key_2 = None
 
 col1, col2 = st.columns(2)
 with col1:
@@ -389,58 +108,319 @@ with col2:
         on_change=reset_group2  # 상태 변경 시 초기화 콜백
     )
 
-def process_uploaded_files(files):
-    all_results = []
-    for file in files:
-        df_raw = load_data(file)
-        if df_raw is None:
+@st.cache_resource
+def get_sentence_archive():
+    """세션 간에 공유되는 과거 기록 보관소"""
+    return SentenceArchive()
+
+@st.cache_resource
+def get_parse_cache():
+    """세션 간에 공유되는 파일 단위 파싱 캐시"""
+    return ParseCache()
+
+@st.cache_resource
+def get_parse_pool():
+    """앱 전체가 함께 쓰는 파싱 프로세스 풀 (fork 를 쓸 수 없거나 워커가 하나면 None)"""
+    if PARSE_POOL_CONTEXT is None or MAX_PARSE_WORKERS <= 1:
+        return None
+    pool = ProcessPoolExecutor(max_workers=MAX_PARSE_WORKERS, mp_context=PARSE_POOL_CONTEXT)
+    pool.submit(int).result()  # fork 방식 풀은 첫 제출 때 워커를 모두 띄우므로 지금 한꺼번에 fork
+    return pool
+
+def parse_pool():
+    """공유 파싱 풀. 워커가 비정상 종료되어 풀이 깨졌으면 새로 만듦"""
+    pool = get_parse_pool()
+    if pool is not None:
+        try:
+            pool.submit(int)
+        except BrokenProcessPool:
+            get_parse_pool.clear()
+            pool = get_parse_pool()
+    return pool
+
+@st.cache_resource
+def get_result_cache():
+    """세션 간에 공유되는 분석 결과 캐시 (메모리 예산 안에서 오래 안 쓴 결과부터 제거)"""
+    return ResultCache()
+
+def new_render_profile(name):
+    """화면 영역 하나의 새 그리기 측정 기록 (조각이 따로 다시 실행될 때도 새로 만듦)"""
+    profile = RunProfile(kind='render')
+    st.session_state.render_profiles[name] = profile
+    return profile
+
+def log_render_profile(profile):
+    """분석 옵션에서 켠 경우에만 그리기 기록을 계측 로그에 덧붙임 (위젯을 조작할 때마다 기록되므로 기본은 끔)"""
+    if st.session_state.get('log_render_profile', False):
+        profile.write_jsonl()
+
+def start_analysis(files_by_group, kind='analysis', near_duplicates=False, similarity_threshold=NEAR_DUP_THRESHOLD, cprofile=False):
+    """그룹별 분석을 백그라운드 작업으로 시작 (실행 중인 작업은 취소하지만 이미 파싱한 파일은 파싱 캐시에 남음).
+    정확히 같은 문장 모드는 그룹 색인에 바뀐 파일만 반영하고, 유사 문장 모드는 같은 파일 · 옵션이면 캐시된 결과를 사용"""
+    if st.session_state.analysis_job is not None:
+        st.session_state.analysis_job.cancel()
+    inputs = {group: [(file.name, file.getvalue()) for file in files] for group, files in files_by_group.items()}
+    # 작업 중에도 이전 결과(교차 검증 등)를 그릴 수 있도록 색인은 복사본을 갱신
+    indexes = {group: copy.deepcopy(st.session_state[f'dup_index_{group}']) for group in inputs}
+    parse_cache, result_cache = get_parse_cache(), get_result_cache()
+    # 그룹을 동시에 실행해도 파싱은 공유 풀 하나에 제출하므로 프로세스 수는 늘지 않음.
+    # cProfile 은 현재 프로세스만 기록하므로 프로파일 실행 시에는 순차 파싱
+    pool = parse_pool() if not cprofile else None
+    max_workers = MAX_PARSE_WORKERS if pool is not None else 1
+
+    def run(group, progress, cancel, profile):
+        profile.group = f"그룹{group}"
+        return analyze_group(
+            inputs[group], near_duplicates, similarity_threshold, indexes[group],
+            cache=parse_cache,
+            max_workers=max_workers,
+            executor=pool,
+            profile=profile,
+            result_cache=result_cache,
+            progress=progress,
+            cancel=cancel
+        )
+
+    groups = {group: [file_name for file_name, _ in named_files] for group, named_files in inputs.items()}
+    profile = RunProfile(kind=kind, cprofile=cprofile)
+    st.session_state.analysis_job = AnalysisJob(groups, run, profile).start()
+
+def apply_analysis_job(job, files_by_group, similarity_threshold):
+    """끝난 작업의 그룹 결과(결과 DataFrame, 문장 테이블, 결과 지문, 색인)를 세션 상태에 저장.
+    작업 중에 파일이 바뀐 그룹은 색인이 있으면 바뀐 파일만 다시 반영하고, 없으면 결과를 버림"""
+    for group, (final_df, sentences, failures, result_key, index) in job.results.items():
+        for file_name, error in failures:
+            st.error(f"파일 오류 ({file_name}): {error}")
+        named_files = [(file.name, file.getvalue()) for file in files_by_group[group] or []]
+        if index is not None:
+            if result_key != analysis_key(named_files, False):
+                st.session_state[f'sync_group_{group}'] = True
+        elif result_key != analysis_key(named_files, True, similarity_threshold):
             continue
-            
-        grade_class = extract_grade_class(df_raw)
-        file_type = detect_file_type(df_raw)
-        
-        processed_df = None
-        if file_type == 'HANG':
-            processed_df = process_hang(df_raw, grade_class)
-        elif file_type == 'KYO':
-            processed_df = process_kyo(df_raw, grade_class)
-        elif file_type == 'CHANG':
-            processed_df = process_chang(df_raw, grade_class)
-            
-        if processed_df is not None and not processed_df.empty:
-            processed_df['유형'] = file_type 
-            all_results.append(processed_df)
-
-    if all_results:
-        final_df = pd.concat(all_results, ignore_index=True)
-        final_df = final_df.sort_values(by=['과목/영역', '번호'])
-        return detect_duplicates(final_df)
-    return None
+        st.session_state[f'final_df_{group}'] = final_df
+        st.session_state[f'sentences_{group}'] = sentences
+        st.session_state[f'result_key_{group}'] = result_key if final_df is not None else None
+        st.session_state[f'dup_index_{group}'] = index
+
+    for group, snapshot in job.snapshot().items():
+        if snapshot['state'] == 'failed':
+            st.error(f"그룹 {group} 분석 오류: {snapshot['error']}")
+    if job.cancelled:
+        st.info("분석을 취소했습니다. 이미 파싱한 파일은 다음 분석에서 다시 사용합니다.")
+    elif job.profile.kind == 'analysis':
+        st.success("모든 파일 처리 완료!")
+    job.profile.write_jsonl()
+    st.session_state.run_profile = job.profile
+
+@st.fragment(run_every=PROGRESS_POLL_SECONDS)
+def render_analysis_progress():
+    """실행 중인 작업의 그룹별 · 파일별 진행 상황 (이 조각만 주기적으로 다시 그리고, 작업이 끝나면 앱 전체를 다시 실행)"""
+    job = st.session_state.analysis_job
+    if job is None:
+        return
+    if not job.running:
+        st.rerun()
+    label = "분석 취소 중..." if job.cancelled else "파일 분석 및 처리 중..."
+    with st.status(label, expanded=True):
+        for group, snapshot in job.snapshot().items():
+            total = len(snapshot['files'])
+            if snapshot['parsing']:
+                detail = f"파싱 중: {', '.join(snapshot['parsing'])}"
+            elif snapshot['state'] == 'running' and snapshot['finished'] == total:
+                detail = "중복 탐지 및 결과 정리 중"
+            else:
+                detail = {'queued': "대기 중", 'cancelled': "취소됨", 'failed': "오류", 'done': "완료"}.get(snapshot['state'], "")
+            st.progress(snapshot['finished'] / max(total, 1), text=f"그룹 {group}: 파일 {snapshot['finished']}/{total} · {detail}")
+            with st.expander(f"그룹 {group} 파일별 상태"):
+                st.dataframe(
+                    pd.DataFrame(
+                        [(name, FILE_STATUS_LABELS[status]) for name, status in snapshot['files']],
+                        columns=['파일', '상태']
+                    ),
+                    use_container_width=True,
+                    hide_index=True
+                )
+        st.button("⏹️ 분석 취소", on_click=job.cancel, disabled=job.cancelled, key="cancel_analysis")
+
+with st.expander("⚙️ 분석 옵션"):
+    near_duplicates = st.checkbox(
+        "유사 문장 탐지 (조사·이름 등 일부만 바꾼 문장도 복붙으로 표시)",
+        value=False,
+        key="near_duplicates"
+    )
+    similarity_threshold = st.slider(
+        "유사도 기준",
+        min_value=0.5, max_value=1.0, value=NEAR_DUP_THRESHOLD, step=0.05,
+        disabled=not near_duplicates,
+        key="similarity_threshold"
+    )
+    pair_threshold = st.slider(
+        "학생 쌍 유사도 기준 (두 학생 중 문장이 적은 학생의 기록 중 이 비율 이상이 겹치면 표시)",
+        min_value=0.1, max_value=1.0, value=PAIR_THRESHOLD, step=0.05,
+        key="pair_threshold"
+    )
+    # 한 번만 적용되는 옵션: 프로파일을 기록한 다음 실행에서 체크 해제
+    if st.session_state.pop('cprofile_done', False):
+        st.session_state.cprofile_once = False
+    cprofile_once = st.checkbox(
+        "다음 분석 1회 cProfile 기록 (함수별 처리 시간을 진단 정보에 표시, 파싱은 순차 처리)",
+        value=False,
+        key="cprofile_once"
+    )
+    st.checkbox(
+        "화면 그리기 시간도 계측 로그에 기록 (위젯을 조작할 때마다 기록, 분석 실행 기록은 항상 남김)",
+        value=False,
+        key="log_render_profile"
+    )
 
+files_by_group = {1: uploaded_files_1, 2: uploaded_files_2}
 if st.button("🚀 전체 파일 분석 시작", type="primary", use_container_width=True):
     if not uploaded_files_1 and not uploaded_files_2:
         st.warning("분석할 파일을 하나 이상 업로드해주세요.")
     else:
-        with st.status("파일 분석 및 처리 중...", expanded=True) as status:
-            if uploaded_files_1:
-                st.write("진행중: 그룹 1 분석...")
-                st.session_state.final_df_1 = process_uploaded_files(uploaded_files_1)
-            
-            if uploaded_files_2:
-                st.write("진행중: 그룹 2 분석...")
-                st.session_state.final_df_2 = process_uploaded_files(uploaded_files_2)
-                
-            status.update(label="모든 파일 처리 완료!", state="complete", expanded=False)
+        # 다시 누르면 실행 중인 작업을 취소하고 새로 시작 (이미 파싱한 파일은 파싱 캐시에서 재사용)
+        start_analysis(
+            {group: files for group, files in files_by_group.items() if files},
+            near_duplicates=near_duplicates, similarity_threshold=similarity_threshold, cprofile=cprofile_once
+        )
+        st.session_state.cprofile_done = cprofile_once
+    for group in (1, 2):
+        st.session_state.pop(f'sync_group_{group}', None)  # 방금 전체 분석을 시작했으므로 따로 반영할 필요 없음
+
+# 끝난 작업의 결과 반영 (실행 중이면 진행 상황만 표시하고 이전 결과는 그대로 보여줌)
+job = st.session_state.analysis_job
+if job is not None and not job.running:
+    st.session_state.analysis_job = None
+    apply_analysis_job(job, files_by_group, similarity_threshold)
+
+# 색인이 있는 그룹은 파일이 추가 / 삭제되면 바뀐 파일만 반영 (모든 파일을 지우면 결과도 지움).
+# 작업이 실행 중이면 끝난 뒤에 반영
+if st.session_state.analysis_job is None:
+    sync_groups = {}
+    for group, files in files_by_group.items():
+        if not st.session_state.pop(f'sync_group_{group}', False):
+            continue
+        if files:
+            sync_groups[group] = files
+        else:
+            for name in ('final_df', 'sentences', 'result_key', 'dup_index'):
+                st.session_state[f'{name}_{group}'] = None
+    if sync_groups:
+        start_analysis(sync_groups, kind='sync')
+
+if st.session_state.analysis_job is not None:
+    render_analysis_progress()
 
 # 하나 이상의 그룹 데이터가 분석 완료되었을 경우에만 결과 표시
 if st.session_state.final_df_1 is not None or st.session_state.final_df_2 is not None:
     st.divider()
+    # 결과 화면 그리기 단계 측정 (다시 그릴 때마다 새로 기록, 조각은 각자 따로 기록)
+    render_profile = new_render_profile('main')
+    result_cache = get_result_cache()
+    result_key_1, result_key_2 = st.session_state.result_key_1, st.session_state.result_key_2
+
+    cross_df = None
+    if st.session_state.final_df_1 is not None and st.session_state.final_df_2 is not None:
+        with render_profile.stage('run_cross_validation') as counts:
+            index_1, index_2 = st.session_state.dup_index_1, st.session_state.dup_index_2
+            if index_1 is not None and index_2 is not None:  # 두 색인의 문장 키 교집합 (사용 내역은 색인에 보관)
+                cross_df = result_cache.get_or_compute(('cross', result_key_1, result_key_2), lambda: cross_validate(index_1, index_2))
+            else:
+                cross_df = result_cache.get_or_compute(('cross', result_key_1, result_key_2), lambda: duplicates.run_cross_validation(
+                    st.session_state.final_df_1, st.session_state.final_df_2,
+                    st.session_state.sentences_1, st.session_state.sentences_2
+                ))
+            counts['rows'] = len(cross_df) if cross_df is not None else 0
+
+    # 그룹별 학생 쌍 유사도 (기준을 바꿔도 분석은 다시 하지 않고 이 표만 다시 계산)
+    pairs_by_group = {}
+    for group, result_key in ((1, result_key_1), (2, result_key_2)):
+        sentences = st.session_state[f'sentences_{group}']
+        if sentences is None:
+            pairs_by_group[group] = None
+            continue
+        render_profile.group = f"그룹{group}"
+        with render_profile.stage('student_pairs') as counts:
+            pairs_by_group[group] = result_cache.get_or_compute(
+                ('pairs', result_key, pair_threshold), lambda: student_pairs(sentences, pair_threshold)
+            )
+            counts['rows'] = len(pairs_by_group[group])
+    render_profile.group = None
+
+    # 전체 보고서는 다운로드 버튼을 누를 때만 만듦 (학생 쌍 기준을 바꿀 때마다 통합 문서를 다시 쓰지 않음)
+    report_inputs = (
+        st.session_state.final_df_1, st.session_state.final_df_2, cross_df,
+        *(pairs if pairs is not None and not pairs.empty else None for pairs in pairs_by_group.values())
+    )
+    report_key = ('report', result_key_1, result_key_2, pair_threshold)
+
+    def report_data():
+        return result_cache.get_or_compute(report_key, lambda: export.to_excel_report(*report_inputs))
+
+    st.download_button(
+        label="📥 전체 결과 엑셀 파일 다운로드 (그룹1 · 그룹2 · 교차 검증 · 학생 쌍 유사도 시트)",
+        data=report_data,
+        file_name="생기부_전체_정리결과.xlsx",
+        mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+        key="download_btn_report",
+        on_click="ignore"  # 다운로드만으로는 앱을 다시 실행하지 않음
+    )
     
-    tab1, tab2, tab3 = st.tabs(["📊 그룹 1 결과보기", "📊 그룹 2 결과보기", "🔄 교차 검증 결과 (그룹1 ↔ 그룹2)"])
+    tab1, tab2, tab3, tab4, tab5 = st.tabs([
+        "📊 그룹 1 결과보기", "📊 그룹 2 결과보기", "🔄 교차 검증 결과 (그룹1 ↔ 그룹2)", "👥 학생 쌍 유사도", "🗂️ 과거 기록 대조"
+    ])
     
-    def render_result_tab(df, group_name):
-        if df is not None:
-            styler, display_cols = style_dataframe(df)
+    PAGE_SIZES = [50, 100, 200, 500]
+
+    @st.fragment
+    def render_result_tab(df, group_name, result_key):
+        """필터 · 페이지 조작은 이 조각만 다시 실행하고, 스타일은 보이는 페이지에만 적용"""
+        profile = new_render_profile(f'result_{group_name}')
+        _render_result_tab(df, group_name, result_key, profile)
+        log_render_profile(profile)
+
+    def _render_result_tab(df, group_name, result_key, profile):
+        if df is None:
+            st.info(f"{group_name}에 처리할 수 있는 정상적인 데이터가 없거나 분석되지 않았습니다.")
+            return
+
+        filter_cols = st.columns([1, 2, 2, 2])
+        with filter_cols[0]:
+            duplicates_only = st.checkbox("복붙 의심 행만", key=f"filter_dup_{group_name}")
+        with filter_cols[1]:
+            subjects = st.multiselect("과목/영역", sorted(df['과목/영역'].dropna().astype(str).unique()), key=f"filter_subject_{group_name}")
+        with filter_cols[2]:
+            grade_classes = st.multiselect("학년 반", sorted(df['학년 반'].dropna().astype(str).unique()), key=f"filter_class_{group_name}")
+        with filter_cols[3]:
+            numbers = st.multiselect("번호", sorted(df['번호'].dropna().unique()), key=f"filter_number_{group_name}")
+
+        profile.group = group_name
+        with profile.stage('filter_results') as counts:
+            filtered = filter_results(df, duplicates_only, subjects, grade_classes, numbers)
+            counts['rows'] = len(filtered)
+
+        page_cols = st.columns([1, 1, 4])
+        with page_cols[0]:
+            page_size = st.selectbox("페이지당 행 수", PAGE_SIZES, key=f"page_size_{group_name}")
+        _, page_count = page_of(filtered, 1, page_size)
+        page_key = f"page_{group_name}"
+        if st.session_state.get(page_key, 1) > page_count:  # 필터로 행이 줄면 마지막 페이지로
+            st.session_state[page_key] = page_count
+        with page_cols[1]:
+            page = st.number_input(f"페이지 (전체 {page_count})", min_value=1, max_value=page_count, step=1, key=page_key)
+        page_df, _ = page_of(filtered, page, page_size)
+        with page_cols[2]:
+            start = (page - 1) * page_size
+            if page_df.empty:
+                st.caption(f"전체 {len(df):,}행 중 조건에 맞는 행이 없습니다.")
+            else:
+                st.caption(f"전체 {len(df):,}행 중 조건에 맞는 {len(filtered):,}행 · {start + 1:,}–{start + len(page_df):,}행 표시")
+
+        with profile.stage('style_dataframe') as counts:
+            styler, display_cols = style_dataframe(page_df)
+            counts['rows'] = len(page_df)
+        with profile.stage('render_dataframe') as counts:
+            counts['rows'] = len(page_df)
             st.dataframe(
                 styler,
                 column_order=display_cols,
@@ -452,27 +432,76 @@ if st.session_state.final_df_1 is not None or st.session_state.final_df_2 is not
                 use_container_width=True,
                 hide_index=True
             )
-            
-            excel_data = to_excel_with_style(df)
-            st.download_button(
-                label=f"📥 {group_name} 엑셀 파일 다운로드 (.xlsx)",
-                data=excel_data,
-                file_name=f"생기부_{group_name}_정리결과.xlsx",
-                mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
-                key=f"download_btn_{group_name}" 
+
+        with profile.stage('to_excel_with_style') as counts:
+            excel_data = result_cache.get_or_compute(('excel', result_key), lambda: export.to_excel_with_style(df))
+            counts['rows'] = len(df)
+        st.download_button(
+            label=f"📥 {group_name} 엑셀 파일 다운로드 (.xlsx, 전체 행)",
+            data=excel_data,
+            file_name=f"생기부_{group_name}_정리결과.xlsx",
+            mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+            key=f"download_btn_{group_name}",
+            on_click="ignore"
+        )
+
+    @st.fragment
+    def render_multi_cross():
+        """업로드 그룹 / 학년 / 학년 반 단위를 한꺼번에 교차 검증 (단위 선택은 이 조각만 다시 실행)"""
+        profile = new_render_profile('multi_cross')
+        _render_multi_cross(profile)
+        log_render_profile(profile)
+
+    def _render_multi_cross(profile):
+        unit = st.radio(
+            "비교 단위 (업로드한 그룹을 이 단위로 나누어 모든 단위를 서로 비교)",
+            list(CROSS_UNIT_LABELS), format_func=CROSS_UNIT_LABELS.get, horizontal=True, key="multi_cross_unit"
+        )
+        units = duplicates.split_sentences({"그룹1": st.session_state.sentences_1, "그룹2": st.session_state.sentences_2}, unit)
+        if len(units) < 2:
+            st.info("비교할 단위가 2개 이상이어야 합니다. 다른 비교 단위를 선택하거나 그룹을 더 업로드해주세요.")
+            return
+
+        with profile.stage('run_multi_cross_validation') as counts:
+            multi_df, matrix = result_cache.get_or_compute(
+                ('multi_cross', unit, result_key_1, result_key_2), lambda: duplicates.run_multi_cross_validation(units)
             )
-        else:
-            st.info(f"{group_name}에 처리할 수 있는 정상적인 데이터가 없거나 분석되지 않았습니다.")
+            counts['rows'] = len(multi_df) if multi_df is not None else 0
+        st.markdown(f"**단위 간 공유 문장 수** ({len(units)}개 단위, 대각선은 단위의 서로 다른 문장 수)")
+        st.dataframe(matrix, use_container_width=True)
+        if multi_df is None:
+            st.success("🎉 단위 간에 겹치는 문장이 발견되지 않았습니다!")
+            return
+
+        st.warning(f"⚠️ 2개 이상 단위에 나온 문장 **{len(multi_df)}개**가 발견되었습니다.")
+        st.dataframe(
+            multi_df,
+            column_config={
+                "복붙 의심 문장": st.column_config.TextColumn("복붙 의심 문장", width="large"),
+                "그룹별 학년 반": st.column_config.TextColumn("그룹별 학년 반", width="large"),
+            },
+            use_container_width=True,
+            hide_index=True
+        )
+        st.download_button(
+            label="📥 여러 단위 교차 검증 엑셀 파일 다운로드 (공유 문장 · 공유 문장 수 시트)",
+            data=result_cache.get_or_compute(
+                ('multi_cross_excel', unit, result_key_1, result_key_2), lambda: export.to_excel_multi_cross(multi_df, matrix)
+            ),
+            file_name=f"생기부_{CROSS_UNIT_LABELS[unit]}별_교차검증결과.xlsx",
+            mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+            key="download_btn_multi_cross",
+            on_click="ignore"
+        )
 
     with tab1:
-        render_result_tab(st.session_state.final_df_1, "그룹1")
+        render_result_tab(st.session_state.final_df_1, "그룹1", result_key_1)
         
     with tab2:
-        render_result_tab(st.session_state.final_df_2, "그룹2")
+        render_result_tab(st.session_state.final_df_2, "그룹2", result_key_2)
         
     with tab3:
         if st.session_state.final_df_1 is not None and st.session_state.final_df_2 is not None:
-            cross_df = run_cross_validation(st.session_state.final_df_1, st.session_state.final_df_2)
             if cross_df is not None and not cross_df.empty:
                 st.success(f"⚠️ 두 그룹 사이에서 총 **{len(cross_df)}개**의 동일 문장이 발견되었습니다.")
                 st.dataframe(
@@ -490,3 +519,134 @@ if st.session_state.final_df_1 is not None or st.session_state.final_df_2 is not
                 st.success("🎉 두 그룹 간에 교차되는 중복(복붙) 문장이 발견되지 않았습니다!")
         else:
             st.warning("교차 검증을 진행하려면 그룹 1과 그룹 2 모두 업로드 및 분석이 완료되어야 합니다.")
+
+        st.divider()
+        st.subheader("여러 단위 교차 검증")
+        render_multi_cross()
+
+    with tab4:
+        st.caption(
+            f"같은 과목/영역 안에서 두 학생의 기록이 겹침 비율 {pair_threshold:g} 이상, 공유 문장 2개 이상인 쌍을 겹침 비율 순으로 표시합니다. "
+            "겹침 비율은 공유 문장 수를 두 학생 중 문장이 적은 학생의 문장 수로 나눈 값이고, Jaccard 는 두 학생 문장의 합집합 크기로 나눈 값입니다."
+        )
+        for group, pairs in pairs_by_group.items():
+            if pairs is None:
+                continue
+            group_name = f"그룹{group}"
+            st.subheader(group_name)
+            if pairs.empty:
+                st.success(f"🎉 {group_name}에서 기록이 기준 이상 겹치는 학생 쌍이 발견되지 않았습니다.")
+                continue
+            st.warning(f"⚠️ {group_name}에서 기록이 기준 이상 겹치는 학생 쌍 **{len(pairs)}개**가 발견되었습니다.")
+            st.dataframe(
+                pairs,
+                column_config={
+                    "겹침 비율": st.column_config.NumberColumn("겹침 비율", format="%.3f"),
+                    "Jaccard": st.column_config.NumberColumn("Jaccard", format="%.3f"),
+                },
+                use_container_width=True,
+                hide_index=True
+            )
+            st.download_button(
+                label=f"📥 {group_name} 학생 쌍 유사도 엑셀 파일 다운로드",
+                data=result_cache.get_or_compute(
+                    ('pairs_excel', st.session_state[f'result_key_{group}'], pair_threshold),
+                    lambda: export.write_excel({'학생 쌍 유사도': pairs})
+                ),
+                file_name=f"생기부_{group_name}_학생쌍유사도.xlsx",
+                mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+                key=f"download_btn_pairs_{group_name}",
+                on_click="ignore"
+            )
+
+    def render_archive_tab(archive):
+        """과거 기록 보관소 대조. 대조 결과 · 기록 수는 (결과 지문, 학년도, 보관소 변경 횟수) 로 캐시"""
+        archive_count = result_cache.get_or_compute(('archive_count', archive.path, archive.version), archive.count)
+        st.caption(f"보관소에 저장된 문장 기록: {archive_count:,}건 (`{archive.path}`)")
+        source_year = st.text_input(
+            "이번 기록의 학년도 (보관 시 출처로 저장되며, 대조할 때는 같은 학년도 기록을 제외합니다)",
+            value=str(pd.Timestamp.now().year),
+            key="archive_year"
+        )
+
+        for group in (1, 2):
+            sentences, group_name = st.session_state[f'sentences_{group}'], f"그룹{group}"
+            if sentences is None:
+                continue
+            st.subheader(f"{group_name} ↔ 과거 기록")
+            render_profile.group = group_name
+            with render_profile.stage('check_against_archive') as counts:
+                archive_df = result_cache.get_or_compute(
+                    ('archive_check', st.session_state[f'result_key_{group}'], source_year, archive.path, archive.version),
+                    lambda: check_against_archive(sentences, archive, exclude_year=source_year)
+                )
+                counts['sentences'] = len(sentences)
+            if archive_df is not None:
+                st.warning(f"⚠️ {group_name}에서 과거 기록과 같은 문장 **{len(archive_df)}개**가 발견되었습니다.")
+                st.dataframe(
+                    archive_df,
+                    column_config={
+                        "복붙 의심 문장": st.column_config.TextColumn("복붙 의심 문장", width="large"),
+                        "이번 파일의 학년 반": st.column_config.TextColumn("이번 파일의 학년 반", width="medium"),
+                        "과거 기록 (연도 학년 반)": st.column_config.TextColumn("과거 기록 (연도 학년 반)", width="medium"),
+                    },
+                    use_container_width=True,
+                    hide_index=True
+                )
+            else:
+                st.success(f"🎉 {group_name}에서 과거 기록과 겹치는 문장이 발견되지 않았습니다.")
+
+            if st.button(f"📥 {group_name} 문장을 {source_year} 기록으로 보관소에 추가", key=f"archive_btn_{group_name}"):
+                added = archive.append(sentences, source_year)
+                st.success(f"{added:,}건의 문장 기록을 보관소에 추가했습니다.")
+
+    with tab5:
+        # 보관소 파일이 아직 없으면 사용하겠다고 할 때까지 만들지 않음 (결과를 볼 때마다 작업 폴더에 SQLite 파일이 생기지 않도록)
+        if os.path.exists(ARCHIVE_PATH) or st.session_state.get('archive_enabled', False):
+            render_archive_tab(get_sentence_archive())
+        else:
+            st.info(f"과거 기록 보관소(`{ARCHIVE_PATH}`)가 아직 없습니다. 보관소를 만들면 이번 기록을 보관하고 다음 해 기록과 대조할 수 있습니다.")
+            if st.button("🗂️ 보관소 만들기", key="archive_enable"):
+                st.session_state.archive_enabled = True
+                st.rerun()
+
+    # 진단 정보: 마지막 분석 실행과 이번 화면 그리기의 단계별 측정값
+    render_profile.group = None
+    log_render_profile(render_profile)
+    with st.expander("🩺 진단 정보 (단계별 처리 시간 · 메모리)"):
+        run_profile = st.session_state.run_profile
+        stage_columns = {
+            "seconds": st.column_config.NumberColumn("시간(초)", format="%.3f"),
+            "rows_per_s": st.column_config.NumberColumn("초당 행 수", format="%.0f"),
+            "peak_rss_mb": st.column_config.NumberColumn("최대 RSS(MB)", format="%.1f"),
+        }
+        if run_profile is not None:
+            st.markdown(f"**마지막 분석 실행** (`{run_profile.run_id}`, {run_profile.started_at})")
+            st.dataframe(run_profile.to_frame(), column_config=stage_columns, use_container_width=True, hide_index=True)
+        st.markdown("**이번 화면 그리기** (결과 탭 · 여러 단위 교차 검증은 각 영역을 마지막으로 그린 기록)")
+        render_all = RunProfile(kind='render')
+        render_all.records = [rec for profile in st.session_state.render_profiles.values() for rec in profile.records]
+        st.dataframe(render_all.to_frame(), column_config=stage_columns, use_container_width=True, hide_index=True)
+        cache_stats = result_cache.stats()
+        st.caption(
+            f"결과 캐시: 적중 {cache_stats['hits']:,}회 · 실패 {cache_stats['misses']:,}회 · 제거 {cache_stats['evictions']:,}회, "
+            f"{cache_stats['entries']}개 항목 {cache_stats['bytes'] / 2**20:,.1f}MB / {cache_stats['max_bytes'] / 2**20:,.0f}MB"
+        )
+        if PROFILE_LOG_PATH:
+            st.caption(
+                f"분석 실행 측정 기록은 `{PROFILE_LOG_PATH}` 에 JSON lines 로 누적됩니다"
+                + (" (화면 그리기 기록 포함)." if st.session_state.log_render_profile else ".")
+            )
+
+        report = run_profile.cprofile_report() if run_profile is not None else None
+        if report:
+            st.markdown("**cProfile (누적 시간 상위 함수)**")
+            st.code(report, language=None)
+            st.download_button(
+                label="📥 cProfile 요약 다운로드 (.txt)",
+                data=report,
+                file_name=f"hakcompare_cprofile_{run_profile.run_id}.txt",
+                mime="text/plain",
+                key="download_btn_cprofile",
+                on_click="ignore"
+            )
@@ -0,0 +1,66 @@
+"""학생부 점검 도우미 핵심 로직 (Streamlit 없이 사용 가능)
+
+무거운 의존성(pandas, openpyxl 등)은 실제로 쓰는 이름에 처음 접근할 때 불러온다.
+"""
+import importlib
+
+_EXPORTS = {
+    'read_raw_data': 'loader',
+    'load_data': 'loader',
+    'iter_excel_rows': 'loader',
+    'extract_grade_class': 'layout',
+    'detect_file_type': 'layout',
+    'scan_layout': 'layout',
+    'register_layout': 'layout',
+    'LayoutRule': 'layout',
+    'SheetLayout': 'layout',
+    'process_hang': 'processors',
+    'process_kyo': 'processors',
+    'process_chang': 'processors',
+    'parse_file': 'parsing',
+    'parse_files': 'parsing',
+    'parse_excel_streaming': 'parsing',
+    'AnalysisCancelled': 'parsing',
+    'ParseCache': 'cache',
+    'parse_files_cached': 'cache',
+    'ResultCache': 'cache',
+    'analysis_key': 'cache',
+    'cluster_near_duplicates': 'near_duplicates',
+    'NEAR_DUP_THRESHOLD': 'near_duplicates',
+    'COLOR_PALETTE': 'duplicates',
+    'build_sentence_table': 'duplicates',
+    'analyze_duplicates': 'duplicates',
+    'detect_duplicates': 'duplicates',
+    'run_cross_validation': 'duplicates',
+    'run_multi_cross_validation': 'duplicates',
+    'split_sentences': 'duplicates',
+    'style_dataframe': 'export',
+    'to_excel_with_style': 'export',
+    'to_excel_report': 'export',
+    'write_excel': 'export',
+    'to_excel_multi_cross': 'export',
+    'SentenceArchive': 'archive',
+    'check_against_archive': 'archive',
+    'RunProfile': 'profiling',
+    'combine_parsed': 'pipeline',
+    'analyze_files': 'pipeline',
+    'sync_index': 'pipeline',
+    'analyze_group': 'pipeline',
+    'DuplicateIndex': 'incremental',
+    'cross_validate': 'incremental',
+    'AnalysisJob': 'worker',
+    'student_pairs': 'similarity',
+    'PAIR_THRESHOLD': 'similarity',
+}
+
+__all__ = sorted(_EXPORTS)
+
+def __getattr__(name):
+    if name not in _EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f".{_EXPORTS[name]}", __name__), name)
+    globals()[name] = value
+    return value
+
+def __dir__():
+    return sorted(list(globals()) + __all__)
@@ -0,0 +1,123 @@
+"""과거 기록 보관소 (다년도 문장 색인, SQLite)"""
+import os
+import sqlite3
+import hashlib
+
+import pandas as pd
+
+from .duplicates import _join_by_group, _usage_by_sentence
+
+ARCHIVE_PATH = os.environ.get('HAKCOMPARE_ARCHIVE_PATH', 'hakcompare_archive.sqlite3')
+
+def sentence_hash(sentence):
+    """문장의 64비트 해시 (파이썬 실행마다 바뀌지 않도록 blake2b 사용)"""
+    digest = hashlib.blake2b(sentence.encode('utf-8'), digest_size=8).digest()
+    return int.from_bytes(digest, 'little', signed=True)
+
+def _hashed_sentences(sentences):
+    """문장 테이블에 '해시' 열 추가 (같은 문장은 한 번만 계산)"""
+    hashed = sentences.copy()
+    unique = pd.unique(hashed['문장'])
+    hashes = pd.Series([sentence_hash(s) for s in unique], index=unique, dtype='int64')
+    hashed['해시'] = hashed['문장'].map(hashes).astype('int64')
+    return hashed
+
+class SentenceArchive:
+    """(유형, 과목/영역, 문장 해시) 로 색인한 과거 문장 보관소 (SQLite). 원본 파일 없이 새 기록과 대조"""
+
+    def __init__(self, path=ARCHIVE_PATH):
+        self.path = path
+        self.version = 0  # append 로 기록이 추가될 때마다 증가 (대조 결과 캐시 키)
+        with self._connect() as conn:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS sentences (
+                    file_type TEXT NOT NULL,
+                    subject TEXT NOT NULL,
+                    hash INTEGER NOT NULL,
+                    grade_class TEXT NOT NULL,
+                    number INTEGER NOT NULL,
+                    source_year TEXT NOT NULL,
+                    UNIQUE (file_type, subject, hash, grade_class, number, source_year)
+                )
+            """)
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_sentences_key ON sentences (file_type, subject, hash)")
+
+    def _connect(self):
+        return sqlite3.connect(self.path, timeout=30)
+
+    def count(self):
+        with self._connect() as conn:
+            return conn.execute("SELECT COUNT(*) FROM sentences").fetchone()[0]
+
+    def append(self, sentences, source_year):
+        """문장 테이블을 보관소에 추가 (이미 있는 문장-학생 조합은 건너뜀). 새로 추가된 행 수 반환"""
+        if sentences is None or sentences.empty:
+            return 0
+        hashed = _hashed_sentences(sentences).drop_duplicates(['유형', '과목/영역', '해시', '학년 반', '번호'])
+        records = zip(
+            hashed['유형'].astype(str), hashed['과목/영역'].astype(str), hashed['해시'].tolist(),
+            hashed['학년 반'].astype(str), hashed['번호'].astype(int).tolist(), [str(source_year)] * len(hashed)
+        )
+        with self._connect() as conn:
+            before = conn.total_changes
+            conn.executemany(
+                "INSERT OR IGNORE INTO sentences "
+                "(file_type, subject, hash, grade_class, number, source_year) VALUES (?, ?, ?, ?, ?, ?)",
+                records
+            )
+            added = conn.total_changes - before
+        if added:
+            self.version += 1
+        return added
+
+    def lookup(self, sentences, exclude_year=None):
+        """문장 테이블과 일치하는 보관소 기록을 (유형, 과목/영역, 해시, 학년 반, 번호, 연도) DataFrame 으로 반환"""
+        columns = ['유형', '과목/영역', '해시', '학년 반', '번호', '연도']
+        if sentences is None or sentences.empty:
+            return pd.DataFrame(columns=columns)
+        keys = _hashed_sentences(sentences)[['유형', '과목/영역', '해시']].drop_duplicates().reset_index(drop=True)
+
+        # 문자열 대신 조회 키 번호만 돌려받아 결과 행 생성 비용을 줄임
+        query = """
+            SELECT q.key_id, s.grade_class, s.number, s.source_year
+            FROM temp.query_keys q
+            JOIN sentences s ON s.file_type = q.file_type AND s.subject = q.subject AND s.hash = q.hash
+        """
+        params = ()
+        if exclude_year is not None:
+            query += " WHERE s.source_year != ?"
+            params = (str(exclude_year),)
+
+        with self._connect() as conn:
+            conn.execute("CREATE TEMP TABLE query_keys (key_id INTEGER, file_type TEXT, subject TEXT, hash INTEGER)")
+            conn.executemany(
+                "INSERT INTO temp.query_keys VALUES (?, ?, ?, ?)",
+                zip(range(len(keys)), keys['유형'].astype(str), keys['과목/영역'].astype(str), keys['해시'].tolist())
+            )
+            rows = conn.execute(query, params).fetchall()
+
+        found = pd.DataFrame(rows, columns=['키 번호', '학년 반', '번호', '연도'])
+        matches = keys.iloc[found['키 번호'].to_numpy()].reset_index(drop=True)
+        matches[['학년 반', '번호', '연도']] = found[['학년 반', '번호', '연도']]
+        return matches[columns]
+
+def check_against_archive(sentences, archive, exclude_year=None):
+    """새 그룹의 문장 중 보관소(과거 기록)에 이미 있는 문장 보고서. 없으면 None"""
+    matches = archive.lookup(sentences, exclude_year)
+    if matches.empty:
+        return None
+
+    hashed = _hashed_sentences(sentences)
+    hashed = hashed.merge(matches[['유형', '과목/영역', '해시']].drop_duplicates(), on=['유형', '과목/영역', '해시'])
+    current = _usage_by_sentence(hashed).rename(columns={'사용': '이번 파일의 학년 반'})
+    current = current.merge(hashed[['유형', '과목/영역', '문장', '해시']].drop_duplicates(), on=['유형', '과목/영역', '문장'])
+
+    matches = matches.sort_values(['연도', '학년 반', '번호'], kind='stable')
+    matches['번호'] = matches['번호'].astype(str) + '번'
+    past = _join_by_group(matches, ['유형', '과목/영역', '해시', '연도', '학년 반'], '번호', ', ')
+    past['사용'] = '[' + past['연도'] + ' ' + past['학년 반'] + '] ' + past['번호']
+    past = _join_by_group(past, ['유형', '과목/영역', '해시'], '사용', ' \n ')
+
+    report = current.merge(past[['유형', '과목/영역', '해시', '사용']], on=['유형', '과목/영역', '해시'])
+    report = report.rename(columns={'문장': '복붙 의심 문장', '사용': '과거 기록 (연도 학년 반)'})
+    return report[['과목/영역', '복붙 의심 문장', '이번 파일의 학년 반', '과거 기록 (연도 학년 반)']]
@@ -0,0 +1,248 @@
+"""파일 내용 해시 기반 파싱 결과 캐시와 분석 결과 캐시"""
+import os
+import sys
+import json
+import zlib
+import sqlite3
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+from .parsing import parse_files
+
+PARSER_VERSION = 2  # 정리 결과 형식이 바뀌면 올려서 기존 캐시를 무효화
+PARSE_CACHE_MAX_ENTRIES = int(os.environ.get('HAKCOMPARE_PARSE_CACHE_SIZE', '256'))
+PARSE_CACHE_DIR = os.environ.get('HAKCOMPARE_CACHE_DIR') or None  # 지정하면 SQLite 파일로 디스크에도 보관
+PARSE_CACHE_FORMAT = 1  # 디스크 항목 형식 (JSON + zlib, 읽을 때 코드가 실행되지 않도록 pickle 은 쓰지 않음)
+RESULT_CACHE_MAX_MB = float(os.environ.get('HAKCOMPARE_RESULT_CACHE_MB', '256'))
+
+logger = logging.getLogger(__name__)
+
+def parse_cache_key(file_name, file_bytes):
+    """파일 내용 해시 기반 캐시 키 (확장자에 따라 읽는 방식이 달라서 함께 포함).
+    디스크에 보관한 DataFrame 은 pandas 버전이 바뀌면 다르게 읽힐 수 있어 pandas 버전도 포함"""
+    file_ext = file_name.split('.')[-1].lower()
+    return f"v{PARSER_VERSION}:pd{pd.__version__}:{file_ext}:{hashlib.sha256(file_bytes).hexdigest()}"
+
+def encode_frame(df):
+    """정리된 DataFrame 을 디스크 캐시용 바이트로 (열별 값 목록 JSON 을 zlib 압축).
+    범주형은 (범주, 코드) 로, object 열은 값 그대로 (정수 · 실수 · 문자열 · None 이 섞여도 타입 유지) 저장.
+    JSON 으로 나타낼 수 없는 값(날짜 등)이 있으면 None (디스크에는 보관하지 않음)"""
+    if df is None:
+        payload = None
+    else:
+        index = df.index
+        payload = {
+            'index': [index.start, index.stop, index.step] if isinstance(index, pd.RangeIndex) else None,
+            'index_values': None if isinstance(index, pd.RangeIndex) else index.tolist(),
+            'columns': [],
+        }
+        for col in df.columns:
+            series = df[col]
+            if isinstance(series.dtype, pd.CategoricalDtype):
+                entry = {'kind': 'category', 'categories': series.cat.categories.tolist(), 'codes': series.cat.codes.tolist()}
+            elif series.dtype == object:
+                entry = {'kind': 'object', 'values': series.tolist()}
+            else:
+                entry = {'kind': 'array', 'dtype': str(series.dtype), 'values': series.tolist()}
+            payload['columns'].append(dict(entry, name=col))
+    try:
+        text = json.dumps({'format': PARSE_CACHE_FORMAT, 'frame': payload}, ensure_ascii=False)
+    except (TypeError, ValueError):
+        return None
+    return zlib.compress(text.encode('utf-8'), 1)  # 압축률보다 속도 (파싱보다 훨씬 빨라야 의미가 있음)
+
+def decode_frame(data):
+    """encode_frame 의 역변환 (형식이 맞지 않으면 ValueError 등)"""
+    document = json.loads(zlib.decompress(data).decode('utf-8'))
+    if document.get('format') != PARSE_CACHE_FORMAT:
+        raise ValueError(f"알 수 없는 캐시 형식: {document.get('format')}")
+    payload = document['frame']
+    if payload is None:
+        return None
+    index = (
+        pd.RangeIndex(*payload['index']) if payload['index'] is not None else pd.Index(payload['index_values'])
+    )
+    columns = {}
+    for entry in payload['columns']:
+        if entry['kind'] == 'category':
+            values = pd.Categorical.from_codes(entry['codes'], categories=entry['categories'])
+        elif entry['kind'] == 'object':
+            values = pd.array(entry['values'], dtype=object)
+        else:
+            values = np.array(entry['values'], dtype=entry['dtype'])
+        columns[entry['name']] = values
+    return pd.DataFrame(columns, index=index)
+
+class ParseCache:
+    """파일 내용 해시 → 정리된 DataFrame 캐시. 메모리에는 LRU 로, cache_dir 가 있으면 SQLite 에도 보관
+    (디스크 항목은 encode_frame 형식이라 캐시 폴더를 다른 사용자가 고쳐도 코드가 실행되지 않음)"""
+
+    def __init__(self, max_entries=PARSE_CACHE_MAX_ENTRIES, cache_dir=PARSE_CACHE_DIR):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._db_path = None
+        if cache_dir:
+            os.makedirs(cache_dir, exist_ok=True)
+            self._db_path = os.path.join(cache_dir, 'parse_cache.sqlite3')
+            with self._connect() as conn:
+                conn.execute("CREATE TABLE IF NOT EXISTS parsed (key TEXT PRIMARY KEY, payload BLOB NOT NULL)")
+
+    def _connect(self):
+        return sqlite3.connect(self._db_path, timeout=30)
+
+    def _remember(self, key, df):
+        self._entries[key] = df
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def get(self, key):
+        """(캐시 적중 여부, DataFrame 또는 None) 반환. 반환된 DataFrame 은 복사본"""
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                df = self._entries[key]
+                return True, (df.copy() if df is not None else None)
+        if self._db_path is None:
+            return False, None
+
+        with self._connect() as conn:
+            row = conn.execute("SELECT payload FROM parsed WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            return False, None
+        try:
+            df = decode_frame(row[0])
+        except Exception as e:  # 손상된 항목 등은 캐시에 없던 것으로 보고 지운 뒤 다시 파싱
+            logger.warning("파싱 캐시 항목을 읽지 못해 삭제 (%s): %s", key, e)
+            with self._connect() as conn:
+                conn.execute("DELETE FROM parsed WHERE key = ?", (key,))
+            return False, None
+        with self._lock:
+            self._remember(key, df)
+        return True, (df.copy() if df is not None else None)
+
+    def put(self, key, df):
+        with self._lock:
+            self._remember(key, df)
+        payload = encode_frame(df) if self._db_path is not None else None
+        if payload is not None:
+            with self._connect() as conn:
+                conn.execute("INSERT OR REPLACE INTO parsed (key, payload) VALUES (?, ?)", (key, payload))
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+        if self._db_path is not None:
+            with self._connect() as conn:
+                conn.execute("DELETE FROM parsed")
+
+def parse_files_cached(named_files, cache, max_workers=None, mp_context=None, profile=None, progress=None, cancel=None,
+                       executor=None):
+    """캐시에 없는 파일만 parse_files 로 파싱. 반환 형식은 parse_files 와 동일.
+    파싱이 끝난 파일은 바로 캐시에 넣으므로 도중에 취소(AnalysisCancelled)되어도 다음 실행에서 재사용"""
+    keys = [parse_cache_key(file_name, file_bytes) for file_name, file_bytes in named_files]
+    results = [None] * len(named_files)
+    missing = []
+    for i, key in enumerate(keys):
+        found, df = cache.get(key)
+        if found:
+            results[i] = (named_files[i][0], df, None)
+            if progress is not None:
+                progress(i, 'cached')
+            if profile is not None:
+                profile.record('parse_cache_hit', 0.0, named_files[i][0], len(df) if df is not None else None)
+        else:
+            missing.append(i)
+
+    def on_parsed(j, result):
+        file_name, processed_df, error = result
+        if error is None:
+            cache.put(keys[missing[j]], processed_df)
+            processed_df = processed_df.copy() if processed_df is not None else None
+        results[missing[j]] = (file_name, processed_df, error)
+
+    parse_files(
+        [named_files[i] for i in missing], max_workers, mp_context, profile,
+        progress=(lambda j, status: progress(missing[j], status)) if progress is not None else None,
+        cancel=cancel, on_parsed=on_parsed, executor=executor
+    )
+    return results
+
+def analysis_key(named_files, *params):
+    """파일 내용 해시 목록(입력 순서)과 분석 옵션으로 만든 분석 결과 지문"""
+    digest = hashlib.sha256()
+    for file_name, file_bytes in named_files:
+        digest.update(parse_cache_key(file_name, file_bytes).encode())
+        digest.update(b'\0')
+    digest.update(repr(params).encode())
+    return digest.hexdigest()
+
+def estimate_size(value):
+    """캐시 항목의 대략적인 메모리 크기 (바이트)"""
+    if value is None:
+        return 0
+    if isinstance(value, pd.DataFrame):
+        return int(value.memory_usage(index=True, deep=True).sum())
+    if isinstance(value, pd.Series):
+        return int(value.memory_usage(index=True, deep=True))
+    if isinstance(value, (tuple, list)):
+        return sum(estimate_size(v) for v in value)
+    if isinstance(value, (bytes, bytearray)):
+        return len(value)
+    return sys.getsizeof(value)
+
+class ResultCache:
+    """지문(문자열 튜플 등) → 분석 결과 캐시. 메모리 예산(max_bytes)을 넘으면 오래 안 쓴 항목부터 제거.
+    반환값은 공유되므로 호출한 쪽에서 수정하지 않는다"""
+
+    def __init__(self, max_bytes=int(RESULT_CACHE_MAX_MB * 1024 * 1024)):
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()  # 키 → (값, 크기)
+        self._lock = threading.Lock()
+        self.total_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get_or_compute(self, key, compute):
+        """캐시에 있으면 그 값을, 없으면 compute() 결과를 저장하고 반환"""
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return self._entries[key][0]
+            self.misses += 1
+
+        value = compute()
+        size = estimate_size(value)
+        if size > self.max_bytes:
+            return value  # 예산보다 큰 결과는 보관하지 않음
+        with self._lock:
+            if key in self._entries:
+                self.total_bytes -= self._entries.pop(key)[1]
+            self._entries[key] = (value, size)
+            self.total_bytes += size
+            while self.total_bytes > self.max_bytes:
+                _, (_, evicted_size) = self._entries.popitem(last=False)
+                self.total_bytes -= evicted_size
+                self.evictions += 1
+        return value
+
+    def stats(self):
+        """적중 / 실패 / 제거 횟수와 현재 사용량"""
+        with self._lock:
+            return {
+                'hits': self.hits, 'misses': self.misses, 'evictions': self.evictions,
+                'entries': len(self._entries), 'bytes': self.total_bytes, 'max_bytes': self.max_bytes,
+            }
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.total_bytes = 0
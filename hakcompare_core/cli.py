@@ -0,0 +1,196 @@
+"""브라우저 없이 폴더 단위로 점검하는 일괄 처리 CLI
+
+예) python -m hakcompare_core --group1 exports/2학년 --group2 exports/3학년 --output reports --format xlsx json
+    python -m hakcompare_core --groups exports/1학년 exports/2학년 exports/3학년 --cross-by class
+"""
+import os
+import sys
+import argparse
+import contextlib
+import importlib.util
+
+SUPPORTED_EXTENSIONS = ('.xlsx', '.xls', '.csv')
+OUTPUT_FORMATS = ('xlsx', 'parquet', 'json')
+PARQUET_ENGINES = ('pyarrow', 'fastparquet')  # to_parquet 에 필요 (둘 다 선택 설치)
+CROSS_UNITS = ('group', 'grade', 'class')  # duplicates.CROSS_UNITS 와 같음 (CLI 는 pandas 없이 도움말을 보여주도록 따로 둠)
+
+def build_parser():
+    parser = argparse.ArgumentParser(
+        prog='python -m hakcompare_core',
+        description='NEIS 학생부 내보내기 파일을 폴더 단위로 정리하고 복붙 의심 문장을 찾아 보고서로 저장합니다.'
+    )
+    parser.add_argument('--group1', metavar='DIR', help='그룹 1 파일 폴더')
+    parser.add_argument('--group2', metavar='DIR', help='그룹 2 파일 폴더 (지정하면 교차 검증도 수행)')
+    parser.add_argument('--groups', nargs='+', default=[], metavar='DIR',
+                        help='추가 그룹 폴더들 (폴더 이름이 그룹 이름, 모든 그룹을 한 번에 교차 검증)')
+    parser.add_argument('--cross-by', choices=CROSS_UNITS, default='group',
+                        help='여러 그룹 교차 검증 단위: group(그룹 폴더) / grade(학년) / class(학년 반) (기본: group)')
+    parser.add_argument('--output', default='reports', metavar='DIR', help='보고서 저장 폴더 (기본: reports)')
+    parser.add_argument('--format', nargs='+', choices=OUTPUT_FORMATS, default=['xlsx'], help='보고서 형식 (기본: xlsx)')
+    parser.add_argument('--near-duplicates', action='store_true', help='유사 문장도 복붙으로 탐지')
+    parser.add_argument('--threshold', type=float, default=None, help='유사 문장 탐지 유사도 기준 (기본: 0.8)')
+    parser.add_argument('--pair-threshold', type=float, default=None,
+                        help='학생 쌍 유사도 보고서의 겹침 비율 기준 (기본: 0.5)')
+    parser.add_argument('--workers', type=int, default=None, help='파싱 프로세스 수 (1 이면 순차 처리)')
+    parser.add_argument('--cache-dir', metavar='DIR', help='파싱 결과를 보관할 캐시 폴더 (반복 실행 시 바뀐 파일만 다시 파싱)')
+    parser.add_argument('--profile', action='store_true', help='단계별 처리 시간을 출력하고 계측 로그(JSON lines)에 기록')
+    parser.add_argument('--cprofile', action='store_true', help='cProfile 함수 단위 프로파일 요약도 출력 (파싱은 한 프로세스에서 실행)')
+    return parser
+
+def collect_files(directory):
+    """폴더 안의 지원 형식 파일을 이름순으로 (파일 이름, 바이트) 목록으로 읽음"""
+    named_files = []
+    for file_name in sorted(os.listdir(directory)):
+        path = os.path.join(directory, file_name)
+        if os.path.isfile(path) and file_name.lower().endswith(SUPPORTED_EXTENSIONS):
+            with open(path, 'rb') as f:
+                named_files.append((file_name, f.read()))
+    return named_files
+
+def write_report(df, output_dir, base_name, formats):
+    """DataFrame 을 요청한 형식으로 저장하고 저장한 경로 목록 반환"""
+    import pandas as pd
+    from .export import to_excel_with_style
+
+    os.makedirs(output_dir, exist_ok=True)
+    written = []
+    for fmt in formats:
+        path = os.path.join(output_dir, f"{base_name}.{fmt}")
+        if fmt == 'xlsx':
+            with open(path, 'wb') as f:
+                f.write(to_excel_with_style(df))
+        elif fmt == 'parquet':
+            text_cols = [col for col in df.columns if df[col].dtype == object or isinstance(df[col].dtype, pd.CategoricalDtype)]
+            df.astype({col: str for col in text_cols}).to_parquet(path, index=False)
+        elif fmt == 'json':
+            df.to_json(path, orient='records', force_ascii=False, indent=2)
+        written.append(path)
+    return written
+
+def print_profile(profile):
+    """단계별 측정값 요약을 표준 오류로 출력"""
+    summary = profile.to_frame().groupby(['group', 'stage'], dropna=False, sort=False).agg(
+        seconds=('seconds', 'sum'), rows=('rows', 'sum'), peak_rss_mb=('peak_rss_mb', 'max')
+    )
+    print(summary.to_string(), file=sys.stderr)
+    report = profile.cprofile_report()
+    if report:
+        print(report, file=sys.stderr)
+
+def main(argv=None):
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    if args.group1 is None and not args.groups:
+        parser.error('--group1 또는 --groups 중 하나는 지정해야 합니다.')
+    if 'parquet' in args.format and not any(importlib.util.find_spec(engine) for engine in PARQUET_ENGINES):
+        parser.error('parquet 형식으로 저장하려면 pyarrow 또는 fastparquet 를 설치해야 합니다.')
+
+    from .cache import ParseCache
+    from .pipeline import analyze_files
+    from .duplicates import run_cross_validation, run_multi_cross_validation, split_sentences
+    from .export import to_excel_report, write_excel
+    from .similarity import PAIR_THRESHOLD, student_pairs
+    from .near_duplicates import NEAR_DUP_THRESHOLD
+    from .profiling import RunProfile, profile_stage
+
+    threshold = args.threshold if args.threshold is not None else NEAR_DUP_THRESHOLD
+    pair_threshold = args.pair_threshold if args.pair_threshold is not None else PAIR_THRESHOLD
+    cache = ParseCache(cache_dir=args.cache_dir) if args.cache_dir else None
+    profile = RunProfile(kind='cli', cprofile=args.cprofile) if args.profile or args.cprofile else None
+    workers = 1 if args.cprofile else args.workers
+    exit_code = 0
+    results = {}
+
+    groups = [('그룹1', args.group1), ('그룹2', args.group2)]
+    for directory in args.groups:
+        label = os.path.basename(os.path.normpath(directory))
+        while label in dict(groups):
+            label += '_'
+        groups.append((label, directory))
+
+    for label, directory in groups:
+        if directory is None:
+            continue
+        named_files = collect_files(directory)
+        if not named_files:
+            print(f"{label}: 처리할 파일이 없습니다 ({directory})", file=sys.stderr)
+            exit_code = 1
+            continue
+
+        if profile is not None:
+            profile.group = label
+        with profile.profiling() if profile is not None else contextlib.nullcontext():
+            df, sentences, failures = analyze_files(
+                named_files, args.near_duplicates, threshold, cache=cache, max_workers=workers, profile=profile
+            )
+        for file_name, error in failures:
+            print(f"파일 오류 ({file_name}): {error}", file=sys.stderr)
+            exit_code = 1
+        if df is None:
+            print(f"{label}: 처리할 수 있는 정상적인 데이터가 없습니다.", file=sys.stderr)
+            exit_code = 1
+            continue
+
+        written = write_report(df, args.output, f"생기부_{label}_정리결과", args.format)
+        print(f"{label}: 파일 {len(named_files)}개, {len(df)}행, 복붙 의심 {int(df['중복여부'].sum())}행 → {', '.join(written)}")
+
+        with profile_stage(profile, 'student_pairs') as counts:
+            pairs = student_pairs(sentences, pair_threshold)
+            counts['rows'] = len(pairs)
+        if pairs.empty:
+            pairs = None
+        else:
+            written = write_report(pairs, args.output, f"생기부_{label}_학생쌍유사도", args.format)
+            print(f"{label}: 기록이 겹침 비율 {pair_threshold:g} 이상 겹치는 학생 쌍 {len(pairs)}개 → {', '.join(written)}")
+        results[label] = (df, sentences, pairs)
+
+    cross_df = None
+    if '그룹1' in results and '그룹2' in results:
+        (df1, sentences1, _), (df2, sentences2, _) = results['그룹1'], results['그룹2']
+        if profile is not None:
+            profile.group = None
+        with profile_stage(profile, 'run_cross_validation'):
+            cross_df = run_cross_validation(df1, df2, sentences1, sentences2)
+        if cross_df is not None:
+            written = write_report(cross_df, args.output, "생기부_교차검증결과", args.format)
+            print(f"교차 검증: 동일 문장 {len(cross_df)}개 → {', '.join(written)}")
+        else:
+            print("교차 검증: 두 그룹 간에 교차되는 중복 문장이 없습니다.")
+
+    # 그룹1 / 그룹2 두 그룹만이 아니면 (--groups a b 등) 또는 학년 / 학년 반 단위로 나누면 모든 단위를 한 번에 교차 검증
+    multi_report = matrix = None
+    pair_only = set(results) == {'그룹1', '그룹2'}
+    if (len(results) >= 2 and not pair_only) or (results and args.cross_by != 'group'):
+        if profile is not None:
+            profile.group = None
+        with profile_stage(profile, 'run_multi_cross_validation'):
+            units = split_sentences({label: sentences for label, (_, sentences, _) in results.items()}, args.cross_by)
+            multi_report, matrix = run_multi_cross_validation(units)
+        if multi_report is not None:
+            written = write_report(multi_report, args.output, "생기부_여러그룹_교차검증결과", args.format)
+            written += write_report(matrix.reset_index(), args.output, "생기부_그룹간_공유문장수", args.format)
+            print(f"여러 그룹 교차 검증 ({len(units)}개 단위): 2개 이상 단위에 나온 문장 {len(multi_report)}개 → {', '.join(written)}")
+        else:
+            print(f"여러 그룹 교차 검증 ({len(units)}개 단위): 단위 간에 겹치는 문장이 없습니다.")
+
+    if results and 'xlsx' in args.format:
+        path = os.path.join(args.output, "생기부_전체_정리결과.xlsx")
+        with open(path, 'wb') as f:
+            if set(results) <= {'그룹1', '그룹2'} and multi_report is None:
+                f.write(to_excel_report(
+                    results.get('그룹1', (None,))[0], results.get('그룹2', (None,))[0], cross_df,
+                    results.get('그룹1', (None,) * 3)[2], results.get('그룹2', (None,) * 3)[2]
+                ))
+            else:
+                sheets = {f"{label} 정리결과"[:31]: df for label, (df, _, _) in results.items()}
+                sheets.update({f"{label} 학생 쌍 유사도"[:31]: pairs for label, (_, _, pairs) in results.items()})
+                sheets['교차 검증'] = cross_df
+                sheets['여러 그룹 교차 검증'] = multi_report
+                sheets['그룹 간 공유 문장 수'] = matrix.reset_index() if multi_report is not None else None
+                f.write(write_excel(sheets))
+        print(f"전체 결과 (시트별): {path}")
+
+    if profile is not None:
+        print_profile(profile)
+        profile.write_jsonl()
+    return exit_code
@@ -0,0 +1,226 @@
+"""문장 테이블 기반 그룹 내 중복 탐지 및 그룹 간 교차 검증"""
+import numpy as np
+import pandas as pd
+
+from .near_duplicates import NEAR_DUP_THRESHOLD, cluster_near_duplicates
+from .interning import compact_metadata, fill_category, group_hashes, intern_strings, mix_hashes, pool_hashes
+
+COLOR_PALETTE = [
+    '#ffadad', '#ffd6a5', '#fdffb6', '#caffbf', '#9bf6ff', '#a0c4ff', '#bdb2ff', '#ffc6ff', '#fffffc'
+]
+
+SENTENCE_SPLIT_PATTERN = r'[.!?\n]+'
+MIN_SENTENCE_LENGTH = 10
+
+SENTENCE_KEY_COLUMNS = ['유형', '과목/영역']
+SENTENCE_COLUMNS = ['행', '유형', '과목/영역', '학년 반', '번호', '문장']
+RESULT_COLUMNS = ['학년 반', '학기', '과목/영역', '번호', '시수', '내용', '복붙 의심 문장', '중복여부', '색상', '유형']
+
+def build_sentence_table(df):
+    """행 단위 내용을 문장 단위 열 테이블로 펼침 (행 = df 안에서의 위치).
+    문장은 문자열 풀 + 정수 id (Categorical), 메타데이터는 범주형"""
+    if df.empty:
+        table = pd.DataFrame(columns=SENTENCE_COLUMNS).astype({'행': np.int32})
+        table['문장'] = intern_strings(table['문장'].to_numpy())
+        return compact_metadata(table)
+
+    sentences = (
+        df['내용'].astype(str).reset_index(drop=True)
+        .str.split(SENTENCE_SPLIT_PATTERN, regex=True)
+        .explode()
+        .str.strip()
+    )
+    sentences = sentences[sentences.str.len() >= MIN_SENTENCE_LENGTH]
+    positions = sentences.index.to_numpy()
+
+    table = pd.DataFrame({'행': positions.astype(np.int32)})
+    for col in ['유형', '과목/영역', '학년 반', '번호']:
+        values = df[col].array if col in df.columns else np.full(len(df), '', dtype=object)
+        table[col] = values[positions]
+    table['문장'] = intern_strings(sentences.to_numpy())
+    return compact_metadata(table)
+
+def sentence_keys(sentences):
+    """문장 테이블 행별 (유형, 과목/영역, 문장) 64비트 키 (다른 그룹의 테이블과 정수로 비교)"""
+    texts = sentences['문장'].astype('category').array  # 문장 풀이 없는 테이블도 받음
+    return mix_hashes(pool_hashes(texts), group_hashes(sentences['유형'], sentences['과목/영역']))
+
+def _join_by_group(frame, keys, column, sep):
+    """keys 가 같은 행끼리 column 문자열을 sep 로 연결. 그룹은 처음 나온 순서, 나머지 열은 그룹의 첫 행 값"""
+    if frame.empty:
+        return frame.reset_index(drop=True)
+    codes = frame.groupby(keys, sort=False, observed=True).ngroup().to_numpy()
+    order = np.argsort(codes, kind='stable')
+    codes = codes[order]
+    values = frame[column].astype(str).to_numpy()[order].tolist()
+    starts = np.flatnonzero(np.r_[True, codes[1:] != codes[:-1]])
+    ends = np.r_[starts[1:], len(codes)]
+
+    result = frame.iloc[order[starts]].reset_index(drop=True)
+    result[column] = [sep.join(values[a:b]) for a, b in zip(starts, ends)]
+    return result
+
+def _duplicate_keys(sentences, near_duplicates, similarity_threshold):
+    """문장별 중복 판정 키 (문장 풀 id). 유사 문장 탐지 시에는 같은 (유형, 과목/영역) 안의 대표 문장 id"""
+    texts = sentences['문장'].array
+    keys = texts.codes.astype(np.int64)
+    if not near_duplicates:
+        return keys
+    pool = texts.categories
+    for positions in sentences.groupby(SENTENCE_KEY_COLUMNS, sort=False, observed=True).indices.values():
+        unique = pd.unique(keys[positions])
+        representative = cluster_near_duplicates(pool[unique].tolist(), similarity_threshold)
+        representative_ids = pool.get_indexer([representative[t] for t in pool[unique]])
+        order = np.argsort(unique)
+        keys[positions] = representative_ids[order][np.searchsorted(unique[order], keys[positions])]
+    return keys
+
+def analyze_duplicates(df, near_duplicates=False, similarity_threshold=NEAR_DUP_THRESHOLD):
+    """(유형, 과목/영역) 그룹 안에서 반복되는 문장 표시. (결과 DataFrame, 문장 테이블) 반환"""
+    if df.empty: return df, build_sentence_table(df)
+    
+    df = df.copy(deep=False)  # 입력 DataFrame 은 바꾸지 않고 열만 새로 붙임
+    df['과목/영역'] = fill_category(df['과목/영역'], '기타')
+    sentences = build_sentence_table(df)
+
+    # 행이 2개 이상인 (유형, 과목/영역) 그룹의 문장만 비교 대상
+    group_sizes = df.groupby(SENTENCE_KEY_COLUMNS, observed=True)['내용'].transform('size').to_numpy()
+    candidates = sentences[group_sizes[sentences['행'].to_numpy()] >= 2].copy()
+    candidates['키'] = _duplicate_keys(candidates, near_duplicates, similarity_threshold)
+
+    counts = candidates.groupby(SENTENCE_KEY_COLUMNS + ['키'], observed=True)['행'].transform('size')
+    duplicates = candidates[counts > 1].drop_duplicates(['행', '문장'])
+
+    duplicate_color_map = {
+        key: COLOR_PALETTE[i % len(COLOR_PALETTE)] for i, key in enumerate(pd.unique(duplicates['키']))
+    }
+    per_row = _join_by_group(duplicates, ['행'], '문장', ' / ')
+    rows = per_row['행'].to_numpy(dtype=np.int64)
+
+    flags = np.zeros(len(df), dtype=bool)
+    flags[rows] = True
+    suspects = np.full(len(df), '', dtype=object)
+    suspects[rows] = per_row['문장'].to_numpy()
+    colors = np.full(len(df), '', dtype=object)
+    colors[rows] = per_row['키'].map(duplicate_color_map).to_numpy()
+
+    df['중복여부'] = flags
+    df['복붙 의심 문장'] = suspects
+    df['색상'] = colors
+
+    final_cols = [c for c in RESULT_COLUMNS if c in df.columns]
+    return df[final_cols], sentences
+
+def detect_duplicates(df, near_duplicates=False, similarity_threshold=NEAR_DUP_THRESHOLD):
+    """(유형, 과목/영역) 그룹 안에서 반복되는 문장 표시. near_duplicates 이면 유사 문장도 같은 문장으로 취급"""
+    return analyze_duplicates(df, near_duplicates, similarity_threshold)[0]
+
+def _usage_by_sentence(sentences):
+    """문장별 사용 내역 문자열: '[학년 반] 1번, 2번' 을 학년 반이 처음 나온 순서대로 연결"""
+    usage = sentences.drop_duplicates(SENTENCE_KEY_COLUMNS + ['문장', '학년 반', '번호']).copy()
+    usage['학년 반 순서'] = usage.groupby(SENTENCE_KEY_COLUMNS + ['문장', '학년 반'], sort=False, observed=True).ngroup()
+    usage = usage.sort_values(['학년 반 순서', '번호'], kind='stable')
+    usage['번호'] = usage['번호'].astype(str) + '번'
+
+    per_class = _join_by_group(usage, SENTENCE_KEY_COLUMNS + ['문장', '학년 반'], '번호', ', ')
+    per_class['사용'] = '[' + per_class['학년 반'].astype(str) + '] ' + per_class['번호']
+    per_sentence = _join_by_group(per_class, SENTENCE_KEY_COLUMNS + ['문장'], '사용', ' \n ')
+    return per_sentence[SENTENCE_KEY_COLUMNS + ['문장', '사용']]
+
+def run_cross_validation(df1, df2, sentences1=None, sentences2=None):
+    """그룹1과 그룹2 사이의 동일 유형 데이터 교차 검증 (문장 테이블을 넘기면 재사용)"""
+    if df1 is None or df2 is None or df1.empty or df2.empty:
+        return None
+    
+    if sentences1 is None: sentences1 = build_sentence_table(df1)
+    if sentences2 is None: sentences2 = build_sentence_table(df2)
+    
+    # 64비트 키의 정수 교집합으로 겹치는 문장만 남긴 뒤, 사용 내역은 그 문장들만 계산
+    keys1, keys2 = sentence_keys(sentences1), sentence_keys(sentences2)
+    shared = np.intersect1d(keys1, keys2)
+    if not len(shared):
+        return None
+    usage1 = _usage_by_sentence(sentences1[np.isin(keys1, shared)]).rename(columns={'사용': '그룹1 파일의 학년 반'})
+    usage2 = _usage_by_sentence(sentences2[np.isin(keys2, shared)]).rename(columns={'사용': '그룹 2 파일의 학년 반'})
+    usage1[['과목/영역', '문장']] = usage1[['과목/영역', '문장']].astype(object)
+    usage2[['과목/영역', '문장']] = usage2[['과목/영역', '문장']].astype(object)
+    cross_df = usage1.merge(usage2, on=SENTENCE_KEY_COLUMNS + ['문장'], how='inner')  # 문자열로 다시 맞춰 해시 충돌 배제
+    if cross_df.empty:
+        return None
+
+    cross_df = cross_df.rename(columns={'문장': '복붙 의심 문장'})
+    return cross_df[['과목/영역', '복붙 의심 문장', '그룹1 파일의 학년 반', '그룹 2 파일의 학년 반']]
+
+CROSS_UNITS = {'group': None, 'grade': '학년', 'class': '학년 반'}
+MULTI_CROSS_COLUMNS = ['과목/영역', '복붙 의심 문장', '그룹 수', '사용 그룹', '그룹별 학년 반']
+
+def split_sentences(sentences_by_group, by='group'):
+    """{그룹 이름: 문장 테이블} 을 교차 검증 단위(CROSS_UNITS: 그룹 / 학년 / 학년 반)별 {이름: 문장 테이블} 로 나눔.
+    그룹이 여럿이면 이름 앞에 그룹 이름을 붙임"""
+    tables = {name: sentences for name, sentences in sentences_by_group.items() if sentences is not None and not sentences.empty}
+    if CROSS_UNITS[by] is None:
+        return tables
+    units = {}
+    for name, sentences in tables.items():
+        values = sentences['학년 반'].astype(str)
+        if by == 'grade':
+            values = values.str.extract(r'(\d+학년)', expand=False).fillna(values)
+        for value, part in sentences.groupby(values.to_numpy(), sort=True):
+            units[f"{name} {value}" if len(tables) > 1 else value] = part
+    return units
+
+def run_multi_cross_validation(sentences_by_group):
+    """여러 그룹 사이의 교차 검증을 한 번에 ({그룹 이름: 문장 테이블}, 그룹 쌍마다 비교하지 않음).
+    모든 그룹의 (키, 그룹) 쌍을 한 번 정렬해 문장 → 그룹 역색인을 만들고, 2개 이상 그룹에 나온 문장만 사용 내역을 계산.
+    (공유 문장 보고서 또는 None, 그룹 × 그룹 공유 문장 수 행렬 (대각선은 그룹의 서로 다른 문장 수)) 반환"""
+    names = [name for name, sentences in sentences_by_group.items() if sentences is not None and not sentences.empty]
+    tables = [sentences_by_group[name] for name in names]
+    matrix = pd.DataFrame(0, index=pd.Index(names, name='그룹'), columns=names)
+    if len(names) < 2:
+        return None, matrix
+
+    table_keys = [sentence_keys(sentences) for sentences in tables]
+    keys = np.concatenate(table_keys)
+    groups = np.repeat(np.arange(len(names)), [len(sentences) for sentences in tables])
+    order = np.lexsort((groups, keys))
+    keys, groups = keys[order], groups[order]
+    first = np.r_[True, (keys[1:] != keys[:-1]) | (groups[1:] != groups[:-1])]
+    keys, groups = keys[first], groups[first]  # 키별로 모인 서로 다른 (키, 그룹) 쌍
+    starts = np.flatnonzero(np.r_[True, keys[1:] != keys[:-1]])
+    group_counts = np.diff(np.r_[starts, len(keys)])
+    np.fill_diagonal(matrix.values, np.bincount(groups, minlength=len(names)))
+    shared = keys[starts[group_counts >= 2]]
+    if not len(shared):
+        return None, matrix
+
+    # 공유 키의 사용 내역 (학년 반 앞에 그룹 이름을 붙여 한 번에 계산)
+    columns = SENTENCE_KEY_COLUMNS + ['문장', '학년 반', '번호']
+    postings = []
+    for name, sentences, sentence_key in zip(names, tables, table_keys):
+        part = sentences.loc[np.isin(sentence_key, shared), columns].astype({col: object for col in columns[:-1]})
+        part['그룹'] = name
+        postings.append(part)
+    postings = pd.concat(postings, ignore_index=True)
+
+    # 문자열로 다시 묶어 해시 충돌 배제
+    text_keys = SENTENCE_KEY_COLUMNS + ['문장']
+    pairs = postings.drop_duplicates(text_keys + ['그룹'])
+    codes = pairs.groupby(text_keys, sort=False).ngroup().to_numpy()
+    report = _join_by_group(pairs, text_keys, '그룹', ', ')
+    report['그룹 수'] = np.bincount(codes)
+    report = report[report['그룹 수'] >= 2]
+    if report.empty:
+        return None, matrix
+
+    incidence = np.zeros((codes.max() + 1, len(names)), dtype=np.int64)
+    incidence[codes, pd.Index(names).get_indexer(pairs['그룹'])] = 1
+    incidence = incidence[np.bincount(codes) >= 2]
+    overlap = incidence.T @ incidence
+    np.fill_diagonal(overlap, np.diag(matrix.values))
+    matrix.loc[:, :] = overlap
+
+    postings['학년 반'] = postings['그룹'] + ' · ' + postings['학년 반'].astype(str)
+    report = report.merge(_usage_by_sentence(postings), on=text_keys, how='left')
+    report = report.rename(columns={'문장': '복붙 의심 문장', '그룹': '사용 그룹', '사용': '그룹별 학년 반'})
+    report = report.sort_values('그룹 수', ascending=False, kind='stable').reset_index(drop=True)
+    return report[MULTI_CROSS_COLUMNS], matrix
@@ -0,0 +1,121 @@
+"""결과 표 스타일 · 화면용 필터 / 페이지 나누기 및 엑셀 내보내기"""
+import io
+
+import numpy as np
+
+from openpyxl import Workbook
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.styles import Alignment, Border, Font, NamedStyle, PatternFill, Side
+from openpyxl.utils import get_column_letter
+
+HIGHLIGHT_COLUMNS = ['과목/영역', '내용', '복붙 의심 문장']
+HIDDEN_COLUMNS = ['중복여부', '색상', '유형']
+
+_HEADER_FONT = Font(bold=True)
+_HEADER_BORDER = Border(*(Side(style='thin'),) * 4)
+_HEADER_ALIGNMENT = Alignment(horizontal='center', vertical='top')
+_HIGHLIGHT_FONT = Font(color='000000')
+
+def style_dataframe(df_to_style):
+    def row_style(row):
+        styles = [''] * len(row)
+        if row.get('중복여부', False) and row.get('색상', '') != '':
+            bg_color = f"background-color: {row['색상']}; color: black;"
+            for target_col in HIGHLIGHT_COLUMNS:
+                if target_col in row.index:
+                    styles[row.index.get_loc(target_col)] = bg_color
+        return styles
+
+    display_cols = [c for c in df_to_style.columns if c not in HIDDEN_COLUMNS]
+    return df_to_style.style.apply(row_style, axis=1), display_cols
+
+def filter_results(df, duplicates_only=False, subjects=None, grade_classes=None, numbers=None):
+    """결과 DataFrame 에서 조건에 맞는 행만 반환 (비어 있는 조건은 적용하지 않음)"""
+    mask = np.ones(len(df), dtype=bool)
+    if duplicates_only and '중복여부' in df.columns:
+        mask &= df['중복여부'].to_numpy(dtype=bool)
+    for col, values in [('과목/영역', subjects), ('학년 반', grade_classes), ('번호', numbers)]:
+        if values and col in df.columns:
+            mask &= df[col].isin(values).to_numpy()
+    return df[mask] if not mask.all() else df
+
+def page_of(df, page, page_size):
+    """(1 부터 세는 page 번째 행 구간, 전체 페이지 수). page 는 범위 안으로 맞춤"""
+    page_count = max(1, -(-len(df) // page_size))
+    page = min(max(page, 1), page_count)
+    return df.iloc[(page - 1) * page_size:page * page_size], page_count
+
+def _column_width(col):
+    return 50 if '내용' in col or col.endswith('문장') else 12
+
+def _highlight_style(workbook, color):
+    """중복 강조 색상의 이름 있는 서식을 통합 문서에 (없으면) 등록하고 이름 반환"""
+    name = f"중복 {color.lstrip('#').upper()}"
+    if name not in workbook.named_styles:
+        workbook.add_named_style(NamedStyle(
+            name=name, font=_HIGHLIGHT_FONT, fill=PatternFill(fill_type='solid', start_color=color.lstrip('#').upper())
+        ))
+    return name
+
+def _write_sheet(workbook, title, df):
+    """쓰기 전용 시트에 한 번에 기록. 중복 행의 강조 칸만 미리 만든 채우기 서식을 가진 셀로 씀"""
+    worksheet = workbook.create_sheet(title)
+    save_cols = [c for c in df.columns if c not in HIDDEN_COLUMNS]
+    for idx, col in enumerate(save_cols, start=1):
+        worksheet.column_dimensions[get_column_letter(idx)].width = _column_width(col)
+
+    header = []
+    for col in save_cols:
+        cell = WriteOnlyCell(worksheet, value=col)
+        cell.font, cell.border, cell.alignment = _HEADER_FONT, _HEADER_BORDER, _HEADER_ALIGNMENT
+        header.append(cell)
+    worksheet.append(header)
+
+    values = df[save_cols].astype(object)
+    values = values.where(values.notna(), None)
+    flags = df['중복여부'].to_numpy() if '중복여부' in df.columns else [False] * len(df)
+    colors = df['색상'].to_numpy() if '색상' in df.columns else [''] * len(df)
+    highlight_idx = [i for i, col in enumerate(save_cols) if col in HIGHLIGHT_COLUMNS]
+    # 색상별 서식은 통합 문서에 이름 있는 서식으로 한 번만 등록하고 셀에는 이름만 지정 (셀마다 서식 객체를 해시하지 않음)
+    style_names = {}
+
+    for row, flag, color in zip(values.itertuples(index=False, name=None), flags, colors):
+        if flag and color:
+            if color not in style_names:
+                style_names[color] = _highlight_style(workbook, color)
+            row = list(row)
+            for i in highlight_idx:
+                cell = WriteOnlyCell(worksheet, value=row[i])
+                cell.style = style_names[color]
+                row[i] = cell
+        worksheet.append(row)
+
+def write_excel(sheets):
+    """{시트 이름: DataFrame} 을 한 통합 문서로 스트리밍 기록하여 바이트로 반환 (None 인 시트는 건너뜀)"""
+    workbook = Workbook(write_only=True)
+    for title, df in sheets.items():
+        if df is not None:
+            _write_sheet(workbook, title, df)
+    if not workbook.worksheets:
+        workbook.create_sheet('정리결과')
+
+    output = io.BytesIO()
+    workbook.save(output)
+    return output.getvalue()
+
+def to_excel_with_style(df):
+    return write_excel({'정리결과': df})
+
+def to_excel_report(df1=None, df2=None, cross_df=None, pairs1=None, pairs2=None):
+    """그룹1 / 그룹2 / 교차 검증 결과와 그룹별 학생 쌍 유사도를 시트별로 담은 통합 문서"""
+    return write_excel({
+        '그룹1 정리결과': df1, '그룹2 정리결과': df2, '교차 검증': cross_df,
+        '그룹1 학생 쌍 유사도': pairs1, '그룹2 학생 쌍 유사도': pairs2,
+    })
+
+def to_excel_multi_cross(report=None, matrix=None):
+    """여러 그룹 교차 검증 보고서와 그룹 × 그룹 공유 문장 수 행렬을 시트별로 담은 통합 문서"""
+    return write_excel({
+        '여러 그룹 교차 검증': report,
+        '그룹 간 공유 문장 수': matrix.reset_index() if matrix is not None else None,
+    })
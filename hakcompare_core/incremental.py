@@ -0,0 +1,323 @@
+"""파일 단위로 추가 / 제거할 수 있는 그룹 내 중복 색인과 색인 간 교차 검증
+
+정확히 같은 문장만 다룬다. 유사 문장 탐지는 대표 문장이 그룹 전체에 따라 바뀌므로 analyze_duplicates 로 전체 재계산.
+강조 색상은 문장 해시로 정해 파일을 추가 / 제거해도 이미 표시된 색상이 바뀌지 않는다.
+문장은 (유형, 과목/영역, 문장) 의 64비트 키로 세고 (키별 사용 횟수는 정렬된 배열),
+문자열은 색인 전체의 문장 풀에 한 번만 두고 정수 id 로 가리킨다.
+"""
+import zlib
+from collections import OrderedDict
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+from .duplicates import COLOR_PALETTE, RESULT_COLUMNS, build_sentence_table, sentence_keys
+from .interning import compact_metadata, fill_category, group_hashes
+
+@dataclass
+class _IndexedFile:
+    """색인에 들어간 파일 하나 (문장 위치 = 파일 문장 테이블 안에서의 순서)"""
+    name: str
+    n_rows: int
+    keys: np.ndarray        # 문장별 (유형, 과목/영역, 문장) 64비트 키
+    text_ids: np.ndarray    # 문장별 색인 문장 풀 id
+    rows: np.ndarray        # 문장별 행 위치
+    class_ids: np.ndarray   # 문장별 학년 반 번호 (class_names 의 위치)
+    class_names: list
+    numbers: np.ndarray     # 문장별 번호
+    starts: np.ndarray      # 행별 첫 문장 위치 (길이 = 행 수 + 1)
+    row_groups: np.ndarray  # 행별 그룹 번호 (색인의 (유형, 과목/영역) 번호)
+    unique_keys: np.ndarray # 파일에 나온 키 (정렬)
+    key_counts: np.ndarray  # 키별 사용 횟수
+    key_first: np.ndarray   # 키별 첫 문장 위치
+    flags: np.ndarray
+    suspects: np.ndarray
+    colors: np.ndarray
+
+def sentence_color(sentence):
+    """문장마다 고정된 강조 색상 (파일이 추가 / 제거되어도 바뀌지 않음)"""
+    return COLOR_PALETTE[zlib.crc32(sentence.encode('utf-8')) % len(COLOR_PALETTE)]
+
+def _lookup(sorted_keys, keys):
+    """정렬된 키 배열에서 keys 의 위치와 존재 여부"""
+    pos = np.searchsorted(sorted_keys, keys)
+    found = pos < len(sorted_keys)
+    found[found] = sorted_keys[pos[found]] == keys[found]
+    return pos, found
+
+class DuplicateIndex:
+    """그룹 하나의 (유형, 과목/영역, 문장) 사용 횟수 색인.
+
+    파일을 추가 / 제거하면 중복 여부가 바뀐 문장이 들어 있는 행만 다시 계산한다.
+    중복 판정은 analyze_duplicates 의 정확히 같은 문장 모드와 같다:
+    행이 2개 이상인 (유형, 과목/영역) 그룹 안에서 2번 이상 나온 문장.
+    """
+
+    def __init__(self):
+        self._files = OrderedDict()  # 파일 키 → _IndexedFile (추가한 순서 = 결과의 파일 순서)
+        self._seq = {}               # 파일 키 → 추가 순번
+        self._next_seq = 0
+        # 키별 정보 (키 순으로 정렬된 배열)
+        self._keys = np.empty(0, dtype=np.int64)
+        self._counts = np.empty(0, dtype=np.int64)
+        self._key_groups = np.empty(0, dtype=np.int32)
+        self._key_texts = np.empty(0, dtype=np.int32)
+        # (유형, 과목/영역) 그룹: 해시 → 번호, 번호별 행 수 / 이름
+        self._group_ids = {}
+        self._group_rows = np.empty(0, dtype=np.int64)
+        self._group_labels = []
+        self._pool = {}              # 문장 → 문장 풀 id
+        self._texts = []             # 문장 풀 (id → 문장, 제거한 파일의 문장도 남음)
+        self._texts_dtype = None     # 문장 풀의 CategoricalDtype (풀이 늘어날 때만 새로 만듦)
+        self._usage = {}             # 문장 키 → (사용 내역 문자열, 첫 사용 위치)
+        self._base = None            # 모든 파일의 행을 추가한 순서대로 이어 붙인 표 (결과 열 제외)
+        self._base_sentences = None  # 위 표 기준 '행' 의 문장 테이블 ('문장' 은 문장 풀 id)
+        self._result = None
+
+    def __contains__(self, file_key):
+        return file_key in self._files
+
+    def __len__(self):
+        return len(self._files)
+
+    @property
+    def file_keys(self):
+        return list(self._files)
+
+    def _intern(self, texts):
+        ids = np.empty(len(texts), dtype=np.int32)
+        for i, text in enumerate(texts):
+            text_id = self._pool.get(text)
+            if text_id is None:
+                text_id = self._pool[text] = len(self._texts)
+                self._texts.append(text)
+            ids[i] = text_id
+        return ids
+
+    def _pool_dtype(self):
+        if self._texts_dtype is None or len(self._texts_dtype.categories) != len(self._texts):
+            self._texts_dtype = pd.CategoricalDtype(self._texts)
+        return self._texts_dtype
+
+    def _group_numbers(self, hashes, labels):
+        ids = np.empty(len(hashes), dtype=np.int32)
+        for i, group in enumerate(hashes.tolist()):
+            group_id = self._group_ids.get(group)
+            if group_id is None:
+                group_id = self._group_ids[group] = len(self._group_labels)
+                self._group_labels.append(labels[group])
+            ids[i] = group_id
+        if len(self._group_labels) > len(self._group_rows):
+            self._group_rows = np.r_[self._group_rows, np.zeros(len(self._group_labels) - len(self._group_rows), dtype=np.int64)]
+        return ids
+
+    def _duplicate_mask(self, keys):
+        """keys 각각이 지금 중복 문장인지"""
+        pos, found = _lookup(self._keys, keys)
+        pos = pos[found]
+        mask = np.zeros(len(keys), dtype=bool)
+        mask[found] = (self._counts[pos] > 1) & (self._group_rows[self._key_groups[pos]] >= 2)
+        return mask
+
+    def key_text(self, key):
+        """문장 키의 ((유형, 과목/영역), 문장)"""
+        pos = np.searchsorted(self._keys, key)
+        return self._group_labels[self._key_groups[pos]], self._texts[self._key_texts[pos]]
+
+    def _index_file(self, file_name, df):
+        filled = df.assign(**{'과목/영역': fill_category(df['과목/영역'], '기타')})
+        sentences = build_sentence_table(filled)
+        rows = sentences['행'].to_numpy(dtype=np.int64)
+        keys = sentence_keys(sentences)
+        texts = sentences['문장'].array
+        hashes = group_hashes(filled['유형'], filled['과목/영역'])
+        labels = dict(zip(hashes.tolist(), zip(filled['유형'].astype(object), filled['과목/영역'].astype(object))))
+        unique_keys, key_first, key_counts = np.unique(keys, return_index=True, return_counts=True)
+        entry = _IndexedFile(
+            name=file_name,
+            n_rows=len(df),
+            keys=keys,
+            text_ids=self._intern(texts.categories)[texts.codes],
+            rows=rows,
+            class_ids=np.asarray(sentences['학년 반'].array.codes),
+            class_names=[str(c) for c in sentences['학년 반'].array.categories],
+            numbers=sentences['번호'].to_numpy(),
+            starts=np.searchsorted(rows, np.arange(len(df) + 1)),
+            row_groups=self._group_numbers(hashes, labels),
+            unique_keys=unique_keys,
+            key_counts=key_counts,
+            key_first=key_first,
+            flags=np.zeros(len(df), dtype=bool),
+            suspects=np.full(len(df), '', dtype=object),
+            colors=np.full(len(df), '', dtype=object),
+        )
+        return entry, sentences
+
+    def add_file(self, file_key, file_name, df):
+        """파일 하나의 정리 결과(parse_file 결과, None 이면 행 없음)를 추가"""
+        if file_key in self._files:
+            return
+        if df is None:
+            df = pd.DataFrame(columns=['유형', '과목/영역', '학년 반', '번호', '내용'])
+        entry, sentences = self._index_file(file_name, df)
+        groups = np.unique(entry.row_groups)
+        before = self._duplicate_mask(entry.unique_keys), self._group_rows[groups] >= 2
+
+        self._files[file_key] = entry
+        self._seq[file_key] = self._next_seq
+        self._next_seq += 1
+        np.add.at(self._group_rows, entry.row_groups, 1)
+        pos, found = _lookup(self._keys, entry.unique_keys)
+        self._counts[pos[found]] += entry.key_counts[found]
+        new = ~found
+        first = entry.key_first[new]
+        self._keys = np.insert(self._keys, pos[new], entry.unique_keys[new])
+        self._counts = np.insert(self._counts, pos[new], entry.key_counts[new])
+        self._key_groups = np.insert(self._key_groups, pos[new], entry.row_groups[entry.rows[first]])
+        self._key_texts = np.insert(self._key_texts, pos[new], entry.text_ids[first])
+
+        self._refresh(entry, groups, before, skip=file_key)
+        self._update_rows(entry, range(entry.n_rows))
+        if entry.n_rows:
+            offset = len(self._base) if self._base is not None else 0
+            added = sentences.assign(행=entry.rows + offset, 문장=entry.text_ids)
+            # 파일마다 범주를 합치면 느리므로 이어 붙일 때는 object 로 두고 result() 에서 범주형으로 바꿈
+            self._base = pd.concat([self._base, df], ignore_index=True) if offset else df.reset_index(drop=True)
+            self._base_sentences = pd.concat([self._base_sentences, added], ignore_index=True) if offset else added
+
+    def remove_file(self, file_key):
+        """추가했던 파일 하나를 제거"""
+        start = 0
+        for key, e in self._files.items():
+            if key == file_key:
+                break
+            start += e.n_rows
+        entry = self._files.pop(file_key)
+        del self._seq[file_key]
+        groups = np.unique(entry.row_groups)
+        before = self._duplicate_mask(entry.unique_keys), self._group_rows[groups] >= 2
+
+        np.subtract.at(self._group_rows, entry.row_groups, 1)
+        pos = np.searchsorted(self._keys, entry.unique_keys)
+        self._counts[pos] -= entry.key_counts
+        gone = pos[self._counts[pos] <= 0]
+        self._keys, self._counts, self._key_groups, self._key_texts = (
+            np.delete(a, gone) for a in (self._keys, self._counts, self._key_groups, self._key_texts)
+        )
+
+        if entry.n_rows:
+            end = start + entry.n_rows
+            keep = np.r_[0:start, end:len(self._base)]
+            rows = self._base_sentences['행'].to_numpy()
+            sentences = self._base_sentences[(rows < start) | (rows >= end)]
+            shifted = sentences['행'].to_numpy()
+            self._base = self._base.iloc[keep].reset_index(drop=True) if len(keep) else None
+            self._base_sentences = sentences.assign(
+                행=np.where(shifted >= end, shifted - entry.n_rows, shifted)
+            ).reset_index(drop=True) if len(keep) else None
+
+        self._refresh(entry, groups, before)
+
+    def _refresh(self, entry, groups, before, skip=None):
+        """중복 여부가 바뀐 문장이 들어 있는 행만 다시 계산 (skip 파일은 호출한 쪽에서 전부 계산)"""
+        key_status, group_status = before
+        changed = entry.unique_keys[self._duplicate_mask(entry.unique_keys) != key_status]
+        flipped = groups[(self._group_rows[groups] >= 2) != group_status]  # 비교 대상이 되거나 빠진 그룹
+        if len(flipped):
+            in_flipped = np.isin(self._key_groups, flipped) & (self._counts > 1)
+            changed = np.union1d(changed, self._keys[in_flipped])
+
+        if len(changed):
+            for file_key, other in self._files.items():
+                if file_key == skip:
+                    continue
+                hit = np.isin(other.keys, changed)
+                if hit.any():
+                    self._update_rows(other, np.unique(other.rows[hit]).tolist())
+
+        for key in entry.unique_keys.tolist():
+            self._usage.pop(key, None)
+        self._result = None
+
+    def _update_rows(self, entry, rows):
+        duplicate = self._duplicate_mask(entry.keys)
+        keys, text_ids, starts, texts = entry.keys, entry.text_ids, entry.starts, self._texts
+        for row in rows:
+            seen, suspects = set(), []
+            for pos in np.flatnonzero(duplicate[starts[row]:starts[row + 1]]) + starts[row]:
+                if keys[pos] not in seen:
+                    seen.add(keys[pos])
+                    suspects.append(texts[text_ids[pos]])
+            entry.flags[row] = bool(suspects)
+            entry.suspects[row] = ' / '.join(suspects)
+            entry.colors[row] = sentence_color(suspects[0]) if suspects else ''
+
+    def result(self):
+        """analyze_duplicates 와 같은 형식의 (결과 DataFrame, 문장 테이블). 파일이 없으면 (None, None)"""
+        if self._result is not None:
+            return self._result
+        if self._base is None:
+            return None, None
+
+        entries = [e for e in self._files.values() if e.n_rows]
+        combined = self._base.assign(**{
+            '복붙 의심 문장': np.concatenate([e.suspects for e in entries]),
+            '중복여부': np.concatenate([e.flags for e in entries]),
+            '색상': np.concatenate([e.colors for e in entries]),
+        })
+        combined = compact_metadata(combined.sort_values(by=['과목/영역', '번호'], kind='stable'))
+        combined['과목/영역'] = fill_category(combined['과목/영역'], '기타')
+        position = np.empty(len(combined), dtype=np.int64)
+        position[combined.index.to_numpy()] = np.arange(len(combined))
+
+        sentences = self._base_sentences.assign(
+            행=position[self._base_sentences['행'].to_numpy()].astype(np.int32),
+            문장=pd.Categorical.from_codes(self._base_sentences['문장'].to_numpy(), dtype=self._pool_dtype()),
+        )
+        sentences = compact_metadata(sentences.sort_values('행', kind='stable').reset_index(drop=True))
+
+        self._result = (combined[[c for c in RESULT_COLUMNS if c in combined.columns]], sentences)
+        return self._result
+
+    def usages(self, keys):
+        """키별 (사용 내역 문자열 '[학년 반] 1번, 2번', 결과 표에서 처음 나오는 위치) — run_cross_validation 과 같은 형식.
+        새로 계산할 키는 파일마다 한 번의 배열 검색으로 모음"""
+        missing = np.array([k for k in keys if k not in self._usage], dtype=np.int64)
+        if len(missing):
+            uses = {}
+            for file_key, entry in self._files.items():
+                positions = np.flatnonzero(np.isin(entry.keys, missing))
+                for key, number, pos, class_id in zip(
+                    entry.keys[positions].tolist(), entry.numbers[positions].tolist(),
+                    positions.tolist(), entry.class_ids[positions].tolist()
+                ):
+                    uses.setdefault(key, []).append((number, self._seq[file_key], pos, entry.class_names[class_id]))
+            for key, key_uses in uses.items():
+                key_uses.sort()
+                per_class = {}
+                for number, _, _, grade_class in key_uses:
+                    numbers = per_class.setdefault(grade_class, [])
+                    if not numbers or numbers[-1] != number:
+                        numbers.append(number)
+                text = ' \n '.join(
+                    f"[{grade_class}] " + ', '.join(f"{n}번" for n in numbers) for grade_class, numbers in per_class.items()
+                )
+                self._usage[key] = (text, key_uses[0][:3])
+        return [self._usage[k] for k in keys]
+
+def cross_validate(index1, index2):
+    """두 그룹 색인 사이의 교차 검증. run_cross_validation 과 같은 형식 (겹치는 문장이 없으면 None).
+    키 배열의 정수 교집합을 구하고, 사용 내역은 색인에 보관되어 바뀐 파일의 문장만 다시 계산"""
+    shared = [k for k in np.intersect1d(index1._keys, index2._keys).tolist() if index1.key_text(k) == index2.key_text(k)]
+    if not shared:
+        return None
+    texts = [index1.key_text(k) for k in shared]
+    usage1, usage2 = index1.usages(shared), index2.usages(shared)
+    order = sorted(range(len(shared)), key=lambda i: (texts[i][0][1], usage1[i][1]))
+    return pd.DataFrame({
+        '과목/영역': [texts[i][0][1] for i in order],
+        '복붙 의심 문장': [texts[i][1] for i in order],
+        '그룹1 파일의 학년 반': [usage1[i][0] for i in order],
+        '그룹 2 파일의 학년 반': [usage2[i][0] for i in order],
+    })
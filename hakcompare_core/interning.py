@@ -0,0 +1,71 @@
+"""문장 / 메타데이터의 압축 표현 (한 번만 저장하는 문자열 풀 + 정수 id, 64비트 해시 배열, 범주형 열)"""
+import numpy as np
+import pandas as pd
+from pandas.api.types import union_categoricals
+
+METADATA_COLUMNS = ['유형', '과목/영역', '학년 반', '학기']  # 행마다 같은 값이 반복되는 열 (범주형으로 저장)
+
+_HASH_MIX = np.uint64(0x9E3779B97F4A7C15)
+
+def hash_texts(texts):
+    """문자열 목록의 64비트 해시 배열 (int64, 실행마다 같은 값. 보관소의 blake2b 해시와는 다름)"""
+    return pd.util.hash_array(np.asarray(texts, dtype=object)).view(np.int64)
+
+def intern_strings(values):
+    """문자열 배열을 정수 id(codes) + 문자열 풀(categories, 처음 나온 순서) 의 Categorical 로 변환"""
+    codes, pool = pd.factorize(values)
+    return pd.Categorical.from_codes(codes, categories=pool)
+
+def pool_hashes(texts):
+    """Categorical 문자열의 원소별 64비트 해시 (풀의 문자열마다 한 번만 계산)"""
+    return hash_texts(texts.categories)[texts.codes]
+
+def mix_hashes(a, b):
+    """두 64비트 해시 배열을 섞어 하나의 키 배열로"""
+    return ((a.astype(np.uint64) * _HASH_MIX) ^ b.astype(np.uint64)).view(np.int64)
+
+def group_hashes(types, subjects):
+    """행별 (유형, 과목/영역) 의 64비트 해시 배열 (서로 다른 표끼리도 비교 가능)"""
+    type_codes, type_values = pd.factorize(types, use_na_sentinel=False)
+    subject_codes, subject_values = pd.factorize(subjects, use_na_sentinel=False)
+    width = max(len(subject_values), 1)
+    pairs, inverse = np.unique(type_codes.astype(np.int64) * width + subject_codes, return_inverse=True)
+    labels = [f"{type_values[p // width]}\x1f{subject_values[p % width]}" for p in pairs.tolist()]
+    return hash_texts(labels)[inverse.reshape(-1)]
+
+def compact_metadata(df, columns=METADATA_COLUMNS):
+    """반복되는 메타데이터 열을 범주형으로 (제자리 변환, df 반환)"""
+    for col in columns:
+        if col in df.columns and df[col].dtype == object:
+            compact = df[col].astype('category')
+            if len({type(v) for v in compact.cat.categories}) <= 1:  # 숫자와 문자열이 섞인 열(학기 등)은 Arrow 변환이 안 되어 object 유지
+                df[col] = compact
+    return df
+
+def fill_category(series, value):
+    """범주형이어도 쓸 수 있는 fillna (없는 범주는 추가)"""
+    if isinstance(series.dtype, pd.CategoricalDtype) and value not in series.cat.categories:
+        if not series.isna().any():
+            return series
+        series = series.cat.add_categories([value])
+    return series.fillna(value)
+
+def _union(parts, sort):
+    try:
+        return union_categoricals(parts, sort_categories=sort)  # 범주형 열로 정렬해도 문자열 정렬 순서와 같도록
+    except TypeError:  # 파일마다 범주 타입이 다름 (숫자 / 문자열 학기 등) → object 로
+        return np.concatenate([np.asarray(p, dtype=object) for p in parts])
+
+def concat_compact(frames):
+    """DataFrame 들을 이어 붙이되 범주형 열은 범주를 합쳐 범주형 그대로 유지 (pd.concat 은 범주가 다르면 object 로 되돌림).
+    메타데이터 열의 범주는 정렬하고, 문장 풀 같은 나머지 열은 처음 나온 순서를 유지"""
+    frames = [f for f in frames if f is not None]
+    columns = list(dict.fromkeys(col for f in frames for col in f.columns))
+    categorical = [
+        col for col in columns
+        if all(col in f.columns and isinstance(f[col].dtype, pd.CategoricalDtype) for f in frames)
+    ]
+    combined = pd.concat([f.drop(columns=categorical) for f in frames], ignore_index=True)
+    for col in categorical:
+        combined[col] = _union([f[col] for f in frames], sort=col in METADATA_COLUMNS)
+    return compact_metadata(combined[columns])  # 일부 파일에만 있던 메타데이터 열도 범주형으로
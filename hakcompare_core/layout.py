@@ -0,0 +1,131 @@
+"""원본 시트 앞부분을 한 번만 훑어 레이아웃(유형, 헤더 행, 열 역할, 학년 반) 판정
+
+형식별 규칙은 register_layout 으로 등록한다 (기본 형식은 processors 모듈에서 등록).
+"""
+import re
+from dataclasses import dataclass, field
+from typing import Callable, Optional
+
+HEADER_SCAN_ROWS = 20  # 학년 반 / 유형 판정에 사용하는 앞부분 행 수
+GRADE_CLASS_PATTERN = re.compile(r"(\d+)학년\s*(\d+)반")
+UNKNOWN_TYPE = "UNKNOWN"
+UNKNOWN_GRADE_CLASS = "미상"
+
+def _cell_text(value, na='nan'):
+    """셀 값을 pandas astype(str) 과 같은 문자열로 변환"""
+    if value is None or (isinstance(value, float) and value != value):
+        return na
+    return str(value)
+
+@dataclass(frozen=True)
+class LayoutRule:
+    """내보내기 형식 하나의 판정 / 해석 규칙
+
+    detect: 앞부분 행 하나를 공백으로 이은 문자열이 이 형식의 표시인지
+    is_header: 행의 셀 문자열 목록이 헤더 행인지
+    build_header: (헤더 행 값, 바로 위 행 값 또는 None) → 열 이름 목록
+    column_role: 열 이름 → 역할 이름 (쓰지 않는 열은 None)
+    finish: (역할 이름 열만 남은 본문 DataFrame, 학년 반) → 정리된 DataFrame 또는 None
+    """
+    file_type: str
+    detect: Callable[[str], bool]
+    is_header: Callable[[list], bool]
+    build_header: Callable
+    column_role: Callable[[str], Optional[str]]
+    finish: Callable
+
+@dataclass
+class SheetLayout:
+    """scan_layout 결과. header_idx 가 -1 이면 헤더를 찾지 못한 것"""
+    file_type: str = UNKNOWN_TYPE
+    grade_class: str = UNKNOWN_GRADE_CLASS
+    header_idx: int = -1
+    columns: list = field(default_factory=list)
+    roles: dict = field(default_factory=dict)  # 원본 열 번호 → 역할 이름
+    rule: Optional[LayoutRule] = None
+
+    @property
+    def ok(self):
+        return self.rule is not None and self.header_idx != -1
+
+LAYOUT_RULES = []  # 판정 우선순위 순서
+
+def register_layout(rule):
+    """형식 규칙 등록 (같은 유형이 이미 있으면 교체, 아니면 판정 우선순위 맨 뒤에 추가)"""
+    for i, registered in enumerate(LAYOUT_RULES):
+        if registered.file_type == rule.file_type:
+            LAYOUT_RULES[i] = rule
+            return rule
+    LAYOUT_RULES.append(rule)
+    return rule
+
+def registered_layouts():
+    """등록된 형식 규칙 목록 (기본 형식 규칙은 처음 사용할 때 등록)"""
+    from . import processors  # noqa: F401  기본 형식 규칙 등록
+    return LAYOUT_RULES
+
+def frame_rows(df_raw):
+    """원본 DataFrame 의 행을 값 튜플로 하나씩 생성 (필요한 만큼만 읽음)"""
+    return df_raw.itertuples(index=False, name=None)
+
+def _resolve_columns(rule, header_values, upper_values):
+    width = max(len(header_values), len(upper_values) if upper_values is not None else 0)
+    header_values = tuple(header_values) + (float('nan'),) * (width - len(header_values))
+    columns = rule.build_header(header_values, upper_values)
+    roles = {i: rule.column_role(col) for i, col in enumerate(columns)}
+    return columns, {i: role for i, role in roles.items() if role}
+
+def scan_layout(rows, file_type=None):
+    """행 반복자를 앞에서부터 한 번만 훑어 (SheetLayout, 지금까지 읽은 행 목록) 반환.
+
+    학년 반과 유형은 앞부분 HEADER_SCAN_ROWS 행에서 판정하고, 헤더 행은 유형이 정해질 때까지
+    모든 규칙으로, 그 뒤에는 해당 규칙으로만 찾는다. file_type 을 주면 유형 판정은 건너뜀.
+    본문은 읽은 행 목록의 header_idx + 1 번째부터, 그리고 rows 의 남은 행으로 이어진다.
+    """
+    rules = registered_layouts()
+    rule = None
+    if file_type is not None:
+        rule = next((r for r in rules if r.file_type == file_type), None)
+        if rule is None:
+            return SheetLayout(file_type=file_type), []
+
+    consumed, grade_class, header_rows = [], None, {}
+    for i, row in enumerate(rows):
+        consumed.append(row)
+        texts = [_cell_text(v) for v in row]
+        in_head = i < HEADER_SCAN_ROWS
+        if in_head and grade_class is None:
+            grade_class = next((m.group(0) for m in map(GRADE_CLASS_PATTERN.search, texts) if m), None)
+        if in_head and rule is None:
+            joined = " ".join(texts)
+            rule = next((r for r in rules if r.detect(joined)), None)
+
+        for candidate in ([rule] if rule is not None else rules):
+            if candidate.file_type not in header_rows and candidate.is_header(texts):
+                header_rows[candidate.file_type] = i
+
+        head_done = grade_class is not None or i >= HEADER_SCAN_ROWS - 1
+        if rule is None:
+            if i >= HEADER_SCAN_ROWS - 1 and head_done:
+                break
+        elif rule.file_type in header_rows and head_done:
+            break
+
+    layout = SheetLayout(grade_class=grade_class or UNKNOWN_GRADE_CLASS, rule=rule)
+    if rule is None:
+        return layout, consumed
+    layout.file_type = rule.file_type
+    header_idx = header_rows.get(rule.file_type, -1)
+    if header_idx != -1:
+        upper_values = consumed[header_idx - 1] if header_idx > 0 else None
+        layout.header_idx = header_idx
+        layout.columns, layout.roles = _resolve_columns(rule, consumed[header_idx], upper_values)
+    return layout, consumed
+
+def extract_grade_class(df_raw):
+    """학년 반 추출"""
+    return scan_layout(frame_rows(df_raw))[0].grade_class
+
+def detect_file_type(df_raw):
+    """파일 유형 감지 (행특 / 세특 / 창체) - 헤더 기반 정확한 판정"""
+    return scan_layout(frame_rows(df_raw))[0].file_type
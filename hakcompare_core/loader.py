@@ -0,0 +1,120 @@
+"""업로드 파일 로드 (xlsx: openpyxl, 예전 xls: xlrd, CSV: 인코딩 판별 후 pyarrow CSV 엔진)"""
+import io
+import csv
+import codecs
+import logging
+import importlib.util
+
+import numpy as np
+import pandas as pd
+import openpyxl
+
+logger = logging.getLogger(__name__)
+
+ZIP_MAGIC = b'PK\x03\x04'  # xlsx (확장자가 xls 여도 내용이 xlsx 인 내보내기가 있음)
+CSV_ENCODINGS = ('utf-8', 'cp949')  # NEIS 내보내기는 cp949(EUC-KR 확장) 인 경우가 많음
+# pyarrow 가 있으면 pandas 의 pyarrow CSV 엔진 (멀티스레드), 없으면 C 파서
+CSV_ENGINE = 'pyarrow' if importlib.util.find_spec('pyarrow') is not None else 'c'
+HAS_XLRD = importlib.util.find_spec('xlrd') is not None
+
+def is_xlsx(file_bytes):
+    """내용이 xlsx(zip) 인지"""
+    return file_bytes[:4] == ZIP_MAGIC
+
+def is_utf8(data):
+    """바이트 전체가 올바른 UTF-8 인지. pyarrow 가 있으면 문자열을 만들지 않고 복사 없이 검사"""
+    if CSV_ENGINE == 'pyarrow':
+        import pyarrow as pa
+        offsets = pa.py_buffer(np.array([0, len(data)], dtype=np.int64))
+        try:
+            pa.Array.from_buffers(pa.large_binary(), 1, [None, offsets, pa.py_buffer(data)]).cast(pa.large_string())
+        except pa.ArrowInvalid:
+            return False
+        return True
+    try:
+        data.decode('utf-8')
+    except UnicodeDecodeError:
+        return False
+    return True
+
+def decode_csv(data):
+    """CSV 바이트의 (UTF-8 바이트, 원래 인코딩). BOM → UTF-8 → cp949 순으로 판별"""
+    if data.startswith(codecs.BOM_UTF8):
+        return data[len(codecs.BOM_UTF8):], 'utf-8-sig'
+    if is_utf8(data):
+        return data, 'utf-8'
+    for encoding in CSV_ENCODINGS[1:]:
+        try:
+            return data.decode(encoding).encode('utf-8'), encoding
+        except UnicodeDecodeError:
+            continue
+    raise ValueError(f"CSV 인코딩을 알 수 없습니다 ({', '.join(CSV_ENCODINGS)} 로 읽을 수 없음)")
+
+def read_csv_raw(uploaded_file):
+    """CSV 를 헤더 없는 원본 DataFrame 으로 (pd.read_csv(header=None) 과 같은 모양, 결측값은 NaN)"""
+    data, _ = decode_csv(uploaded_file.read())
+    if CSV_ENGINE == 'pyarrow':
+        try:
+            df = pd.read_csv(io.BytesIO(data), header=None, engine='pyarrow')
+            return df.fillna(np.nan)  # pyarrow 엔진은 문자열 열의 결측값을 None 으로 줌
+        except Exception as e:  # 행마다 칸 수가 다른 파일 등은 C 파서로 다시 읽음
+            logger.info("pyarrow CSV 엔진으로 읽지 못해 C 파서 사용 (%s): %s", uploaded_file.name, e)
+    try:
+        return pd.read_csv(io.BytesIO(data), header=None, encoding='utf-8')
+    except pd.errors.ParserError:  # 첫 행(제목 등)보다 칸이 많은 행이 있으면 가장 긴 행에 맞춰 빈 칸을 채움
+        width = max((len(row) for row in csv.reader(io.StringIO(data.decode('utf-8')))), default=0)
+        return pd.read_csv(io.BytesIO(data), header=None, names=range(width), encoding='utf-8')
+
+def read_xls_raw(uploaded_file):
+    """예전 형식(.xls, BIFF) 엑셀을 헤더 없는 원본 DataFrame 으로 (xlrd 필요)"""
+    if not HAS_XLRD:
+        raise ValueError("xls 파일을 읽으려면 xlrd 패키지가 필요합니다 (pip install xlrd)")
+    return pd.read_excel(uploaded_file, header=None, engine='xlrd')
+
+def read_raw_data(uploaded_file):
+    """파일 로드 (CSV, Excel). 지원하지 않는 형식이면 None, 읽기 오류는 예외로 전달"""
+    file_ext = uploaded_file.name.split('.')[-1].lower()
+    if file_ext == 'csv':
+        return read_csv_raw(uploaded_file)
+    elif file_ext in ['xlsx', 'xls']:
+        head = uploaded_file.read(4)
+        uploaded_file.seek(0)
+        if file_ext == 'xls' and not is_xlsx(head):
+            return read_xls_raw(uploaded_file)
+        return pd.read_excel(uploaded_file, header=None, engine='openpyxl')
+    return None
+
+def load_data(uploaded_file):
+    """파일 로드 (CSV, Excel). 읽기 오류는 로그로 남기고 None 반환"""
+    try:
+        return read_raw_data(uploaded_file)
+    except Exception as e:
+        logger.error("파일 오류 (%s): %s", uploaded_file.name, e)
+        return None
+
+# pandas.read_excel 이 결측값으로 읽는 문자열 (기본 na_values)
+EXCEL_NA_STRINGS = frozenset([
+    '', '#N/A', '#N/A N/A', '#NA', '-1.#IND', '-1.#QNAN', '-NaN', '-nan', '1.#IND', '1.#QNAN',
+    '<NA>', 'N/A', 'NA', 'NULL', 'NaN', 'None', 'n/a', 'nan', 'null'
+])
+
+def _excel_value(value):
+    """openpyxl 셀 값을 pandas.read_excel 결과와 같은 값으로 변환"""
+    if value is None:
+        return np.nan
+    if isinstance(value, str):
+        return np.nan if value in EXCEL_NA_STRINGS else value
+    if isinstance(value, float) and value.is_integer():
+        return int(value)
+    return value
+
+def iter_excel_rows(uploaded_file):
+    """읽기 전용 모드로 첫 시트의 행을 하나씩 생성 (워크북 전체를 메모리에 올리지 않음)"""
+    workbook = openpyxl.load_workbook(uploaded_file, read_only=True, data_only=True, keep_links=False)
+    try:
+        sheet = workbook.worksheets[0]
+        sheet.reset_dimensions()
+        for row in sheet.iter_rows(values_only=True):
+            yield tuple(_excel_value(v) for v in row)
+    finally:
+        workbook.close()
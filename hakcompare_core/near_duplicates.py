@@ -0,0 +1,94 @@
+"""MinHash / LSH 기반 유사 문장(근사 중복) 묶기"""
+import re
+import zlib
+
+import numpy as np
+
+# 유사 문장(근사 중복) 탐지 설정
+NEAR_DUP_THRESHOLD = 0.8     # 문자 n-gram 자카드 유사도 기준
+NEAR_DUP_SHINGLE_SIZE = 3    # 문자 n-gram 길이
+NEAR_DUP_NUM_PERM = 64       # MinHash 서명 길이
+NEAR_DUP_MIN_RECALL = 0.999  # 유사도가 딱 기준값인 문장 쌍이 후보로 잡힐 최소 확률
+NEAR_DUP_BUCKET_WINDOW = 64  # LSH 버킷 안에서 각 문장을 비교할 앞 문장 수 (버킷이 이보다 작으면 모든 쌍을 비교)
+_MINHASH_PRIME = np.uint64(4294967311)  # 2^32 보다 큰 소수
+_MINHASH_CHUNK = 1000        # 서명 계산 시 한 번에 처리할 문장 수
+_minhash_rng = np.random.RandomState(20240601)
+_MINHASH_A = _minhash_rng.randint(1, 1 << 31, NEAR_DUP_NUM_PERM, dtype=np.int64).astype(np.uint64)
+_MINHASH_B = _minhash_rng.randint(0, 1 << 32, NEAR_DUP_NUM_PERM, dtype=np.int64).astype(np.uint64)
+
+def _shingles(sentence):
+    """공백을 정규화한 문장의 문자 n-gram 집합"""
+    text = re.sub(r'\s+', ' ', sentence)
+    k = NEAR_DUP_SHINGLE_SIZE
+    if len(text) <= k:
+        return frozenset([text])
+    return frozenset(text[i:i + k] for i in range(len(text) - k + 1))
+
+def _minhash_signatures(shingle_sets):
+    """문장별 MinHash 서명 행렬 (문장 수 x NEAR_DUP_NUM_PERM)"""
+    hashed = [
+        np.fromiter((zlib.crc32(sh.encode('utf-8')) for sh in shingles), dtype=np.uint64, count=len(shingles))
+        for shingles in shingle_sets
+    ]
+    signatures = np.empty((len(hashed), NEAR_DUP_NUM_PERM), dtype=np.uint64)
+    for start in range(0, len(hashed), _MINHASH_CHUNK):
+        chunk = hashed[start:start + _MINHASH_CHUNK]
+        lengths = np.fromiter((len(h) for h in chunk), dtype=np.int64, count=len(chunk))
+        offsets = np.concatenate(([0], np.cumsum(lengths)[:-1]))
+        values = (np.concatenate(chunk)[:, None] * _MINHASH_A + _MINHASH_B) % _MINHASH_PRIME
+        signatures[start:start + len(chunk)] = np.minimum.reduceat(values, offsets, axis=0)
+    return signatures
+
+def _lsh_bands(threshold, min_recall=NEAR_DUP_MIN_RECALL):
+    """유사도가 threshold 인 쌍이 한 밴드 이상에서 겹칠 확률 1 - (1 - t^행)^밴드 가 min_recall 이상인
+    (밴드 수, 밴드당 행 수) 중 행이 가장 많은 (후보가 가장 적은) 것. 후보는 실제 자카드로 다시 확인하므로
+    후보가 늘어도 결과는 틀리지 않음. 예) 기준 0.8 → 16 × 4 (기준값 쌍을 놓칠 확률 약 0.02%,
+    버킷 안의 쌍을 모두 비교할 때. NEAR_DUP_BUCKET_WINDOW 보다 큰 버킷에서는 멀리 떨어진 쌍을 놓칠 수 있음)"""
+    best = (NEAR_DUP_NUM_PERM, 1)
+    for rows in range(1, NEAR_DUP_NUM_PERM + 1):
+        bands = NEAR_DUP_NUM_PERM // rows
+        if 1.0 - (1.0 - threshold ** rows) ** bands >= min_recall:
+            best = (bands, rows)
+    return best
+
+def cluster_near_duplicates(sentences, threshold=NEAR_DUP_THRESHOLD):
+    """MinHash/LSH 로 유사 문장을 묶어 문장별 대표 문장(처음 등장한 문장)을 반환"""
+    sentences = list(dict.fromkeys(sentences))
+    if len(sentences) < 2:
+        return {s: s for s in sentences}
+
+    shingle_sets = [_shingles(s) for s in sentences]
+    signatures = _minhash_signatures(shingle_sets)
+    parent = list(range(len(sentences)))
+
+    def find(i):
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    def jaccard(i, j):
+        a, b = shingle_sets[i], shingle_sets[j]
+        return len(a & b) / len(a | b)
+
+    bands, rows = _lsh_bands(threshold)
+    for band in range(bands):
+        band_sig = signatures[:, band * rows:(band + 1) * rows]
+        bucket_keys = np.zeros(len(sentences), dtype=np.uint64)
+        for col in range(band_sig.shape[1]):
+            bucket_keys = bucket_keys * np.uint64(1000003) ^ band_sig[:, col]
+        order = np.argsort(bucket_keys, kind='stable')
+        sorted_keys = bucket_keys[order]
+        starts = np.flatnonzero(np.r_[True, sorted_keys[1:] != sorted_keys[:-1]])
+        ends = np.r_[starts[1:], len(order)]
+        # 버킷 안에서는 각 문장을 앞의 NEAR_DUP_BUCKET_WINDOW 개 문장과 비교 (이미 같은 묶음인 쌍은 건너뜀).
+        # 아주 큰 버킷(짧은 상투 문구 등)에서도 비교 횟수가 버킷 크기에 비례하도록 제한
+        for start, end in zip(starts, ends):
+            for k in range(start + 1, end):
+                other = order[k]
+                for prev in order[max(start, k - NEAR_DUP_BUCKET_WINDOW):k]:
+                    root_prev, root_other = find(prev), find(other)
+                    if root_prev != root_other and jaccard(prev, other) >= threshold:
+                        parent[max(root_prev, root_other)] = min(root_prev, root_other)
+
+    return {s: sentences[find(i)] for i, s in enumerate(sentences)}
@@ -0,0 +1,141 @@
+"""파일 단위 파싱 (스트리밍 엑셀 로드, 프로세스 풀 병렬 처리)"""
+import io
+import os
+import time
+import itertools
+import contextlib
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+
+from .loader import read_raw_data, iter_excel_rows, is_xlsx
+from .layout import scan_layout, frame_rows
+from .processors import process_frame, build_body_frame
+from .interning import compact_metadata
+
+PARALLEL_MIN_FILES = 4  # 이보다 파일이 적으면 프로세스 기동 비용이 더 커서 순차 처리
+MAX_PARSE_WORKERS = int(os.environ.get('HAKCOMPARE_WORKERS', '0')) or os.cpu_count() or 1
+CANCEL_POLL_SECONDS = 0.2  # 프로세스 풀 파싱 중 취소 요청을 확인하는 간격
+
+class AnalysisCancelled(Exception):
+    """분석 도중 취소 요청(cancel 이벤트)을 받음"""
+
+def check_cancelled(cancel):
+    """cancel(threading.Event 등) 이 설정되어 있으면 AnalysisCancelled"""
+    if cancel is not None and cancel.is_set():
+        raise AnalysisCancelled()
+
+def parse_excel_streaming(uploaded_file, stats=None):
+    """엑셀 파일을 스트리밍으로 정리하여 (정리된 DataFrame 또는 None, 유형) 반환.
+    앞부분 행을 한 번 훑어 레이아웃을 정하고, 본문은 필요한 열만 골라 바로 적재.
+    stats 를 주면 단계별 시간(layout / read / finish, 초)과 본문 행 수(rows)를 채움"""
+    start = time.perf_counter()
+    rows = iter_excel_rows(uploaded_file)
+    layout, consumed = scan_layout(rows)
+    if not layout.ok:
+        rows.close()
+        return None, layout.file_type
+
+    scanned = time.perf_counter()
+    body = build_body_frame(layout, itertools.chain(consumed[layout.header_idx+1:], rows))
+    loaded = time.perf_counter()
+    processed_df = layout.rule.finish(body, layout.grade_class)
+    if stats is not None:
+        stats.update(layout=scanned - start, read=loaded - scanned, finish=time.perf_counter() - loaded, rows=len(body))
+    return processed_df, layout.file_type
+
+def parse_file(file_name, file_bytes, stats=None):
+    """파일 이름과 원본 바이트만으로 파일 하나를 정리 (프로세스 풀 워커에서도 실행됨)"""
+    buffer = io.BytesIO(file_bytes)
+    buffer.name = file_name
+    if file_name.split('.')[-1].lower() in ['xlsx', 'xls'] and is_xlsx(file_bytes):  # 예전 xls 는 xlrd 로 통째로 읽음
+        processed_df, file_type = parse_excel_streaming(buffer, stats)
+    else:
+        start = time.perf_counter()
+        df_raw = read_raw_data(buffer)
+        if df_raw is None:
+            return None
+
+        loaded = time.perf_counter()
+        layout, _ = scan_layout(frame_rows(df_raw))
+        scanned = time.perf_counter()
+        file_type = layout.file_type
+        processed_df = process_frame(df_raw, layout.grade_class, file_type, layout)
+        if stats is not None:
+            stats.update(read=loaded - start, layout=scanned - loaded, finish=time.perf_counter() - scanned, rows=len(df_raw))
+
+    if processed_df is None or processed_df.empty:
+        return None
+    processed_df['유형'] = file_type
+    return compact_metadata(processed_df)
+
+def _parse_file_with_stats(file_name, file_bytes):
+    """워커 실행용: (정리된 DataFrame 또는 None, 파일별 측정값) 반환"""
+    stats = {}
+    start = time.perf_counter()
+    processed_df = parse_file(file_name, file_bytes, stats)
+    stats['seconds'] = time.perf_counter() - start
+    return processed_df, stats
+
+def parse_files(named_files, max_workers=None, mp_context=None, profile=None, progress=None, cancel=None, on_parsed=None,
+                executor=None):
+    """(파일 이름, 바이트) 목록을 파싱하여 입력 순서대로 (파일 이름, DataFrame 또는 None, 오류 메시지) 반환.
+    profile(RunProfile) 을 주면 파일별 측정값을 기록.
+    executor(ProcessPoolExecutor) 를 주면 새 프로세스 풀을 만들지 않고 그 풀에 제출 (여러 스레드가 함께 써도 됨, 종료하지 않음).
+    progress(위치, 상태) 로 파일별 상태('parsing' / 'done' / 'error')를 알리고, 파일 하나가 끝날 때마다 on_parsed(위치, 결과) 호출.
+    cancel 이 설정되면 아직 시작하지 않은 파일은 건너뛰고 (실행 중인 파일은 마저 파싱) AnalysisCancelled"""
+    max_workers = max_workers or MAX_PARSE_WORKERS
+    results = [None] * len(named_files)
+    file_stats = [None] * len(named_files)
+
+    def finish(i, result):
+        results[i] = result
+        if progress is not None:
+            progress(i, 'error' if result[2] is not None else 'done')
+        if on_parsed is not None:
+            on_parsed(i, result)
+
+    if max_workers <= 1 or len(named_files) < PARALLEL_MIN_FILES:
+        for i, (file_name, file_bytes) in enumerate(named_files):
+            check_cancelled(cancel)
+            if progress is not None:
+                progress(i, 'parsing')
+            try:
+                processed_df, file_stats[i] = _parse_file_with_stats(file_name, file_bytes)
+                finish(i, (file_name, processed_df, None))
+            except Exception as e:
+                finish(i, (file_name, None, str(e)))
+    else:
+        pool = (
+            contextlib.nullcontext(executor) if executor is not None
+            else ProcessPoolExecutor(max_workers=min(max_workers, len(named_files)), mp_context=mp_context)
+        )
+        with pool as executor:
+            futures = {
+                executor.submit(_parse_file_with_stats, file_name, file_bytes): i
+                for i, (file_name, file_bytes) in enumerate(named_files)
+            }
+            pending, started = set(futures), set()
+            while pending:
+                done, pending = wait(pending, timeout=CANCEL_POLL_SECONDS, return_when=FIRST_COMPLETED)
+                for future in done:
+                    i = futures[future]
+                    if future.cancelled():
+                        continue
+                    try:
+                        processed_df, file_stats[i] = future.result()
+                        finish(i, (named_files[i][0], processed_df, None))
+                    except Exception as e:
+                        finish(i, (named_files[i][0], None, str(e)))
+                if cancel is not None and cancel.is_set():
+                    pending = {future for future in pending if not future.cancel()}  # 이미 실행 중인 파일은 끝까지 파싱
+                if progress is not None:
+                    for future in pending - started:
+                        if future.running():
+                            started.add(future)
+                            progress(futures[future], 'parsing')
+
+    if profile is not None:
+        for (file_name, _), stats in zip(named_files, file_stats):
+            if stats is not None:
+                profile.record_file(file_name, stats)
+    check_cancelled(cancel)
+    return results
@@ -0,0 +1,124 @@
+"""파싱부터 중복 탐지까지 한 그룹을 처리하는 흐름 (UI 와 CLI 가 공유)"""
+from .cache import parse_files_cached, analysis_key, parse_cache_key
+from .parsing import parse_files, check_cancelled
+from .duplicates import analyze_duplicates
+from .near_duplicates import NEAR_DUP_THRESHOLD
+from .interning import concat_compact
+from .incremental import DuplicateIndex
+from .profiling import profile_stage
+
+def combine_parsed(parsed):
+    """parse_files 결과를 하나의 DataFrame 으로 합침. (DataFrame 또는 None, [(파일 이름, 오류 메시지)]) 반환"""
+    failures = [(file_name, error) for file_name, _, error in parsed if error is not None]
+    frames = [df for _, df, error in parsed if error is None and df is not None]
+    if not frames:
+        return None, failures
+
+    final_df = concat_compact(frames)  # 메타데이터 열은 범주형 유지
+    final_df = final_df.sort_values(by=['과목/영역', '번호'])
+    return final_df, failures
+
+def _parse(named_files, cache, max_workers, mp_context, profile, progress, cancel, executor):
+    if cache is not None:
+        return parse_files_cached(named_files, cache, max_workers, mp_context, profile, progress, cancel, executor)
+    return parse_files(named_files, max_workers, mp_context, profile, progress, cancel, executor=executor)
+
+def analyze_files(named_files, near_duplicates=False, similarity_threshold=NEAR_DUP_THRESHOLD,
+                  cache=None, max_workers=None, mp_context=None, profile=None, result_cache=None, result_key=None,
+                  progress=None, cancel=None, executor=None):
+    """(파일 이름, 바이트) 목록을 정리하고 중복을 탐지. (결과 DataFrame, 문장 테이블, 실패 목록) 반환.
+    profile(RunProfile) 을 주면 단계별 / 파일별 측정값을 기록.
+    result_cache(ResultCache) 를 주면 같은 파일 · 옵션의 결과는 파싱 없이 재사용 (반환값을 수정하지 말 것).
+    progress / cancel / executor 는 parse_files 와 같음 (취소되면 AnalysisCancelled)"""
+    if result_cache is not None:
+        if result_key is None:
+            result_key = analysis_key(named_files, near_duplicates, similarity_threshold)
+        with profile_stage(profile, 'result_cache') as counts:
+            result = result_cache.get_or_compute(
+                ('analyze', result_key),
+                lambda: analyze_files(
+                    named_files, near_duplicates, similarity_threshold, cache, max_workers, mp_context, profile,
+                    progress=progress, cancel=cancel, executor=executor
+                )
+            )
+            counts['rows'] = len(result[0]) if result[0] is not None else 0
+        return result
+
+    with profile_stage(profile, 'parse') as counts:
+        parsed = _parse(named_files, cache, max_workers, mp_context, profile, progress, cancel, executor)
+        counts['rows'] = sum(len(df) for _, df, _ in parsed if df is not None)
+
+    with profile_stage(profile, 'combine'):
+        final_df, failures = combine_parsed(parsed)
+    if final_df is None:
+        return None, None, failures
+    check_cancelled(cancel)
+    with profile_stage(profile, 'analyze_duplicates') as counts:
+        result_df, sentences = analyze_duplicates(final_df, near_duplicates, similarity_threshold)
+        counts.update(rows=len(result_df), sentences=len(sentences))
+    return result_df, sentences, failures
+
+def index_file_keys(named_files):
+    """색인용 파일 키 (내용 해시, 같은 내용의 몇 번째 파일인지). 같은 파일을 두 번 올려도 따로 셈"""
+    seen = {}
+    keys = []
+    for file_name, file_bytes in named_files:
+        key = parse_cache_key(file_name, file_bytes)
+        seen[key] = seen.get(key, 0) + 1
+        keys.append((key, seen[key]))
+    return keys
+
+def sync_index(index, named_files, cache=None, max_workers=None, mp_context=None, profile=None, progress=None, cancel=None,
+               executor=None):
+    """DuplicateIndex 의 파일 구성을 named_files 와 같게 맞춤.
+    새 파일만 파싱해 추가하고 빠진 파일은 색인에서 제거. 실패 목록 [(파일 이름, 오류 메시지)] 반환.
+    파싱 도중 취소되면 색인은 그대로 두고 AnalysisCancelled"""
+    keys = index_file_keys(named_files)
+    new_positions = [i for i, file_key in enumerate(keys) if file_key not in index]
+    if progress is not None:
+        for i in sorted(set(range(len(named_files))) - set(new_positions)):
+            progress(i, 'cached')
+
+    with profile_stage(profile, 'parse') as counts:
+        parsed = _parse(
+            [named_files[i] for i in new_positions], cache, max_workers, mp_context, profile,
+            (lambda j, status: progress(new_positions[j], status)) if progress is not None else None, cancel, executor
+        )
+        counts['rows'] = sum(len(df) for _, df, _ in parsed if df is not None)
+
+    with profile_stage(profile, 'index_remove'):
+        wanted = set(keys)
+        for file_key in index.file_keys:
+            if file_key not in wanted:
+                index.remove_file(file_key)
+
+    failures = []
+    with profile_stage(profile, 'index_add') as counts:
+        for i, (file_name, df, error) in zip(new_positions, parsed):
+            if error is not None:
+                failures.append((file_name, error))
+            else:
+                index.add_file(keys[i], file_name, df)
+        counts['rows'] = sum(len(df) for _, df, error in parsed if error is None and df is not None)
+    return failures
+
+def analyze_group(named_files, near_duplicates=False, similarity_threshold=NEAR_DUP_THRESHOLD, index=None,
+                  cache=None, max_workers=None, mp_context=None, profile=None, result_cache=None, progress=None, cancel=None,
+                  executor=None):
+    """한 그룹 분석. 정확히 같은 문장 모드는 index(DuplicateIndex, 없으면 새로 만듦)에 바뀐 파일만 반영하고,
+    유사 문장 모드는 analyze_files 로 전체 분석 (같은 파일 · 옵션이면 result_cache 의 결과 사용).
+    (결과 DataFrame, 문장 테이블, 실패 목록, 결과 지문, 색인 또는 None) 반환"""
+    if near_duplicates:
+        result_key = analysis_key(named_files, near_duplicates, similarity_threshold)
+        final_df, sentences, failures = analyze_files(
+            named_files, near_duplicates, similarity_threshold, cache, max_workers, mp_context, profile,
+            result_cache=result_cache, result_key=result_key, progress=progress, cancel=cancel, executor=executor
+        )
+        return final_df, sentences, failures, result_key, None
+
+    index = index if index is not None else DuplicateIndex()
+    failures = sync_index(index, named_files, cache, max_workers, mp_context, profile, progress, cancel, executor)
+    with profile_stage(profile, 'index_result') as counts:
+        final_df, sentences = index.result()
+        counts['rows'] = len(final_df) if final_df is not None else 0
+    return final_df, sentences, failures, analysis_key(named_files, near_duplicates), index
@@ -0,0 +1,160 @@
+"""유형별(행특 / 세특 / 창체) 원본 시트 정리"""
+import pandas as pd
+
+from .layout import LayoutRule, register_layout, scan_layout, frame_rows, _cell_text
+
+def _detect_hang(row_str):
+    # 행특: 헤더/제목에 "행동특성" 또는 "종합의견"이 있는 경우
+    return "행 동 특 성" in row_str or "행동특성" in row_str or "종합의견" in row_str
+
+def _detect_kyo(row_str):
+    # 세특: 헤더에 "과목"과 "세부능력"이 함께 있는 경우
+    return ("과" in row_str and "목" in row_str) and "세부능력" in row_str
+
+def _detect_chang(row_str):
+    # 창체: 헤더에 "영역"과 "시간"/"시수"가 함께 있는 경우
+    return ("영" in row_str and "역" in row_str) and ("시" in row_str and "간" in row_str)
+
+def _is_hang_header(row_str):
+    return any('번' in s and '호' in s for s in row_str) and any('성' in s and '명' in s for s in row_str)
+
+def _is_kyo_header(row_str):
+    return any('과' in s and '목' in s for s in row_str) and any('세부능력' in s for s in row_str)
+
+def _is_chang_header(row_str):
+    return any('영' in s and '역' in s for s in row_str) and any('시' in s and '간' in s for s in row_str)
+
+def _plain_header(header_values, upper_values=None):
+    """헤더 행 값을 공백 없는 열 이름으로 변환"""
+    return [_cell_text(v).replace(" ", "") for v in header_values]
+
+def _merged_header(header_values, upper_values=None):
+    """병합된 2단 헤더: 빈 헤더 칸은 바로 위 행의 값으로 채운 뒤 공백 제거"""
+    cols = [_cell_text(v, na='') for v in header_values]
+    if upper_values is not None:
+        upper_row = [_cell_text(v, na='') for v in upper_values]
+        for i in range(len(cols)):
+            if cols[i].strip() == '' or cols[i].lower() == 'nan':
+                if i < len(upper_row) and upper_row[i].strip() != '' and upper_row[i].lower() != 'nan':
+                    cols[i] = upper_row[i]
+    return [c.replace(" ", "") for c in cols]
+
+def _hang_column(col):
+    if '번호' in col: return '번호'
+    elif '행동특성' in col: return '내용'
+    elif '종합의견' in col: return '내용'
+    return None
+
+def _kyo_column(col):
+    if '과목' in col: return '과목/영역'
+    elif '학기' in col: return '학기'
+    elif '번호' in col: return '번호'
+    elif '세부능력' in col: return '내용'
+    elif '특기사항' in col: return '내용'
+    return None
+
+def _chang_column(col):
+    if '번호' in col: return '번호'
+    elif '영역' in col: return '과목/영역'
+    elif '시간' in col: return '시수'
+    elif '특기사항' in col: return '내용'
+    return None
+
+def _finish_hang(df, grade_class):
+    """열 이름이 정리된 행특 본문을 학생별로 합침"""
+    if '번호' not in df.columns or '내용' not in df.columns: return None
+        
+    df['번호'] = pd.to_numeric(df['번호'], errors='coerce')
+    df = df[df['내용'].notna()]
+    df = df[~df['내용'].astype(str).str.contains('행 동 특 성', na=False)]
+    df = df[~df['내용'].astype(str).str.contains('종 합 의 견', na=False)]
+    
+    df['번호'] = df['번호'].ffill()
+    df = df.dropna(subset=['번호'])
+    df['번호'] = df['번호'].astype(int) 
+    
+    df_grouped = df.groupby('번호')['내용'].apply(lambda x: ' '.join(x.astype(str))).reset_index()
+    
+    df_grouped['학년 반'] = grade_class
+    df_grouped['학기'] = ''
+    df_grouped['과목/영역'] = '행동특성'
+    df_grouped['시수'] = ''
+    
+    return df_grouped
+
+def _finish_kyo(df, grade_class):
+    """열 이름이 정리된 세특 본문을 학생/학기/과목별로 합침"""
+    if '내용' not in df.columns or '과목/영역' not in df.columns: return None
+
+    df['번호'] = pd.to_numeric(df['번호'], errors='coerce')
+    df = df[df['과목/영역'] != '과 목']
+    df = df[df['과목/영역'] != '과목']
+    df['번호'] = df['번호'].ffill()
+    df['과목/영역'] = df['과목/영역'].ffill()
+    df['학기'] = df['학기'].ffill()
+    
+    df = df.dropna(subset=['번호', '내용'])
+    df['번호'] = df['번호'].astype(int) 
+    
+    df_grouped = df.groupby(['번호', '학기', '과목/영역'])['내용'].apply(lambda x: ' '.join(x.astype(str))).reset_index()
+    
+    df_grouped['학년 반'] = grade_class
+    df_grouped['시수'] = '' 
+    
+    return df_grouped
+
+def _finish_chang(df, grade_class):
+    """열 이름이 정리된 창체 본문을 학생/영역별로 합침"""
+    if '번호' not in df.columns or '내용' not in df.columns or '과목/영역' not in df.columns:
+        return None
+
+    df['번호'] = pd.to_numeric(df['번호'], errors='coerce')
+    df = df[df['과목/영역'] != '영 역']
+    df = df[df['과목/영역'] != '영역']
+    
+    df['번호'] = df['번호'].ffill()
+    df['과목/영역'] = df['과목/영역'].ffill()
+    df['시수'] = df['시수'].ffill()
+    
+    df = df.dropna(subset=['번호'])
+    df['번호'] = df['번호'].astype(int)
+    
+    df = df[df['내용'].astype(str) != '희망분야']
+    df = df[~df['내용'].astype(str).str.contains('희망분야', na=False)]
+    df = df.dropna(subset=['내용'])
+
+    df_grouped = df.groupby(['번호', '과목/영역', '시수'])['내용'].apply(lambda x: ' '.join(x.astype(str))).reset_index()
+    
+    df_grouped['학년 반'] = grade_class
+    df_grouped['학기'] = '' 
+    
+    return df_grouped
+
+# 기본 형식 규칙 (판정 우선순위: 창체 → 행특 → 세특)
+register_layout(LayoutRule('CHANG', _detect_chang, _is_chang_header, _merged_header, _chang_column, _finish_chang))
+register_layout(LayoutRule('HANG', _detect_hang, _is_hang_header, _plain_header, _hang_column, _finish_hang))
+register_layout(LayoutRule('KYO', _detect_kyo, _is_kyo_header, _plain_header, _kyo_column, _finish_kyo))
+
+def build_body_frame(layout, body_rows):
+    """헤더 아래 행에서 역할이 있는 열만 골라 역할 이름 열의 DataFrame 구성"""
+    body = [tuple(row[i] if i < len(row) else float('nan') for i in layout.roles) for row in body_rows]
+    return pd.DataFrame(body, columns=list(layout.roles.values()), dtype=object)
+
+def process_frame(df_raw, grade_class, file_type, layout=None):
+    """원본 DataFrame 을 레이아웃에 따라 정리 (layout 이 없으면 file_type 규칙으로 헤더를 찾음)"""
+    if layout is None:
+        layout, _ = scan_layout(frame_rows(df_raw), file_type=file_type)
+    if not layout.ok: return None
+
+    df = df_raw.iloc[layout.header_idx+1:, list(layout.roles)]
+    df.columns = list(layout.roles.values())
+    return layout.rule.finish(df.copy(), grade_class)
+
+def process_hang(df_raw, grade_class):
+    return process_frame(df_raw, grade_class, 'HANG')
+
+def process_kyo(df_raw, grade_class):
+    return process_frame(df_raw, grade_class, 'KYO')
+
+def process_chang(df_raw, grade_class):
+    return process_frame(df_raw, grade_class, 'CHANG')
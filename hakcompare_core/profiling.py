@@ -0,0 +1,115 @@
+"""분석 실행 계측 (단계별 / 파일별 벽시계 시간, 처리 행 수, 최대 RSS) 과 선택적 cProfile 기록"""
+import io
+import os
+import sys
+import json
+import time
+import uuid
+import pstats
+import logging
+import cProfile
+import contextlib
+
+import pandas as pd
+
+try:
+    import resource
+except ImportError:  # Windows 에는 resource 모듈이 없음
+    resource = None
+
+logger = logging.getLogger(__name__)
+
+PROFILE_LOG_PATH = os.environ.get('HAKCOMPARE_PROFILE_LOG', 'hakcompare_profile.jsonl')  # 빈 문자열이면 기록 안 함
+
+def peak_rss_mb():
+    """현재 프로세스의 최대 RSS (MB). 측정할 수 없는 환경이면 None"""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return round(peak / 1024 / 1024 if sys.platform == 'darwin' else peak / 1024, 1)  # macOS 는 바이트, 리눅스는 KB
+
+def profile_stage(profile, stage, file=None):
+    """profile 이 None 이면 아무것도 기록하지 않는 stage 컨텍스트"""
+    return profile.stage(stage, file) if profile is not None else contextlib.nullcontext({})
+
+class RunProfile:
+    """실행 1회의 단계별 측정 기록. group 속성을 바꾸면 이후 기록에 그룹 이름이 붙음"""
+
+    def __init__(self, kind='analysis', cprofile=False):
+        self.run_id = uuid.uuid4().hex[:12]
+        self.kind = kind
+        self.started_at = time.strftime('%Y-%m-%dT%H:%M:%S')
+        self.group = None
+        self.records = []
+        self._profiler = cProfile.Profile() if cprofile else None
+
+    def record(self, stage, seconds, file=None, rows=None, sentences=None):
+        """측정값 하나를 기록 (처리량은 rows 기준 초당 행 수)"""
+        self.records.append({
+            'stage': stage,
+            'group': self.group,
+            'file': file,
+            'seconds': round(seconds, 4),
+            'rows': rows,
+            'sentences': sentences,
+            'rows_per_s': round(rows / seconds, 1) if rows and seconds > 0 else None,
+            'peak_rss_mb': peak_rss_mb(),
+        })
+
+    @contextlib.contextmanager
+    def stage(self, stage, file=None):
+        """with 블록의 실행 시간을 기록. 블록 안에서 counts['rows'], counts['sentences'] 를 채우면 함께 기록"""
+        counts = {}
+        start = time.perf_counter()
+        try:
+            yield counts
+        finally:
+            self.record(stage, time.perf_counter() - start, file, counts.get('rows'), counts.get('sentences'))
+
+    def record_file(self, file_name, stats):
+        """parse_file 이 채운 파일별 세부 측정값(stats) 기록"""
+        for stage in ('read', 'layout', 'finish'):
+            if stage in stats:
+                self.record(f'parse_file.{stage}', stats[stage], file_name, stats.get('rows'))
+        self.record('parse_file', stats.get('seconds', 0.0), file_name, stats.get('rows'))
+
+    @contextlib.contextmanager
+    def profiling(self):
+        """cProfile 을 켠 실행이면 with 블록 동안 함수 단위 프로파일 수집"""
+        if self._profiler is None:
+            yield
+            return
+        self._profiler.enable()
+        try:
+            yield
+        finally:
+            self._profiler.disable()
+
+    @property
+    def has_cprofile(self):
+        return self._profiler is not None
+
+    def cprofile_report(self, limit=40):
+        """누적 시간 순 cProfile 요약 문자열 (cProfile 을 켜지 않았으면 None)"""
+        if self._profiler is None:
+            return None
+        out = io.StringIO()
+        pstats.Stats(self._profiler, stream=out).sort_stats('cumulative').print_stats(limit)
+        return out.getvalue()
+
+    def to_frame(self):
+        return pd.DataFrame(self.records, columns=[
+            'stage', 'group', 'file', 'seconds', 'rows', 'sentences', 'rows_per_s', 'peak_rss_mb'
+        ])
+
+    def write_jsonl(self, path=PROFILE_LOG_PATH):
+        """측정 기록을 JSON lines 로 로그 파일에 덧붙임 (로그 기록 실패는 분석을 막지 않음)"""
+        if not path or not self.records:
+            return
+        header = {'run_id': self.run_id, 'kind': self.kind, 'started_at': self.started_at}
+        try:
+            with open(path, 'a', encoding='utf-8') as f:
+                for rec in self.records:
+                    f.write(json.dumps(dict(header, **rec), ensure_ascii=False) + '\n')
+        except OSError as e:
+            logger.warning("계측 로그 기록 실패 (%s): %s", path, e)
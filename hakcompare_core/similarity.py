@@ -0,0 +1,64 @@
+"""학생 쌍 유사도 (기록 대부분을 서로 복사한 학생 쌍 찾기)
+
+(유형, 과목/영역, 학생) × (유형, 과목/영역, 문장) 희소 행렬 A 를 한 번에 만들고 A · Aᵀ 로 학생 쌍별 공유 문장 수를 구한다.
+열에 (유형, 과목/영역) 이 포함되어 있어 다른 과목의 학생끼리는 곱이 0 이므로 과목별로 나누어 반복하지 않는다.
+"""
+import numpy as np
+import pandas as pd
+from scipy import sparse
+
+from .duplicates import SENTENCE_KEY_COLUMNS
+
+PAIR_THRESHOLD = 0.5  # 겹침 비율 기준 (두 학생 중 문장이 적은 학생의 기록 중 이 비율 이상이 겹치면 표시)
+MIN_SHARED_SENTENCES = 2  # 한 문장만 같은 쌍은 흔한 문구일 수 있어 제외
+PAIR_COLUMNS = ['과목/영역', '학생 1', '학생 2', '공유 문장 수', '학생 1 문장 수', '학생 2 문장 수', '겹침 비율', 'Jaccard']
+
+def _combine(*code_arrays):
+    """여러 범주 코드 배열을 하나의 정수 id 로 (처음 나온 순서)"""
+    combined = np.zeros(len(code_arrays[0]), dtype=np.int64)
+    for codes in code_arrays:
+        codes = codes.astype(np.int64) + 1  # 결측(-1) 도 하나의 값으로
+        combined = combined * (codes.max(initial=0) + 1) + codes
+    return pd.factorize(combined)[0]
+
+def student_pairs(sentences, threshold=PAIR_THRESHOLD, min_shared=MIN_SHARED_SENTENCES):
+    """문장 테이블에서 같은 (유형, 과목/영역) 안의 학생 쌍별 공유 문장 수, 겹침 비율, Jaccard 를 구해
+    겹침 비율이 threshold 이상이고 공유 문장이 min_shared 개 이상인 쌍을 겹침 비율 순으로 반환.
+    겹침 비율 = 공유 문장 수 / 두 학생 중 적은 문장 수, Jaccard = 공유 문장 수 / 두 학생 문장의 합집합 크기"""
+    if sentences is None or sentences.empty:
+        return pd.DataFrame(columns=PAIR_COLUMNS)
+
+    group = _combine(*(pd.factorize(sentences[col], use_na_sentinel=False)[0] for col in SENTENCE_KEY_COLUMNS))
+    students = _combine(group, pd.factorize(sentences['학년 반'])[0], pd.factorize(sentences['번호'])[0])
+    columns = _combine(group, sentences['문장'].astype('category').array.codes)
+    incidence = sparse.csr_matrix(
+        (np.ones(len(students), dtype=np.int32), (students, columns)),
+        shape=(students.max() + 1, columns.max() + 1)
+    )
+    incidence.data[:] = 1  # 한 학생이 같은 문장을 여러 번 써도 한 번으로
+    sizes = np.diff(incidence.indptr)
+
+    shared = sparse.triu(incidence @ incidence.T, k=1).tocoo()
+    first, second, counts = shared.row, shared.col, shared.data
+    smaller = np.minimum(sizes[first], sizes[second])
+    overlap = counts / smaller
+    keep = (overlap >= threshold) & (counts >= min_shared)
+    first, second, counts, overlap = first[keep], second[keep], counts[keep], overlap[keep]
+    if not len(counts):
+        return pd.DataFrame(columns=PAIR_COLUMNS)
+
+    # 학생 id → 처음 나온 행의 과목/영역, "학년 반 번호번"
+    rows = pd.Series(students).drop_duplicates().index.to_numpy()
+    meta = sentences.iloc[rows]
+    labels = (meta['학년 반'].astype(str) + ' ' + meta['번호'].astype(str) + '번').to_numpy()
+    report = pd.DataFrame({
+        '과목/영역': meta['과목/영역'].astype(object).to_numpy()[first],
+        '학생 1': labels[first],
+        '학생 2': labels[second],
+        '공유 문장 수': counts,
+        '학생 1 문장 수': sizes[first],
+        '학생 2 문장 수': sizes[second],
+        '겹침 비율': overlap.round(3),
+        'Jaccard': (counts / (sizes[first] + sizes[second] - counts)).round(3),
+    })
+    return report.sort_values(['겹침 비율', '공유 문장 수', 'Jaccard'], ascending=False, kind='stable').reset_index(drop=True)
@@ -0,0 +1,109 @@
+"""백그라운드 분석 작업 (그룹별 분석을 스레드에서 실행하고 파일별 진행 상황 · 취소를 제공)
+
+화면(Streamlit) 코드는 작업을 시작한 뒤 snapshot() 으로 진행 상황을 읽기만 하고,
+작업 스레드는 Streamlit API 를 호출하지 않는다.
+"""
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from .parsing import AnalysisCancelled
+from .profiling import RunProfile
+
+logger = logging.getLogger(__name__)
+
+class GroupProgress:
+    """그룹 하나의 파일별 상태. parse_files 의 progress(위치, 상태) 로 그대로 넘길 수 있음"""
+
+    def __init__(self, file_names, lock):
+        self.file_names = list(file_names)
+        self.statuses = ['queued'] * len(self.file_names)
+        self.state = 'queued'  # queued → running → done / cancelled / failed
+        self.error = None
+        self._lock = lock
+
+    def __call__(self, i, status):
+        with self._lock:
+            self.statuses[i] = status
+
+    def snapshot(self):
+        with self._lock:
+            return {
+                'state': self.state,
+                'error': self.error,
+                'files': list(zip(self.file_names, self.statuses)),
+                'finished': sum(status in ('cached', 'done', 'error') for status in self.statuses),
+                'parsing': [name for name, status in zip(self.file_names, self.statuses) if status == 'parsing'],
+            }
+
+class AnalysisJob:
+    """그룹별 분석 작업. run(그룹, progress, cancel, profile) 이 그룹 결과를 반환하고, 취소되면 AnalysisCancelled 를 던짐.
+    그룹은 동시에 실행하고 그룹별 측정 기록은 끝난 뒤 profile 에 그룹 순서대로 합침.
+    cProfile 을 켠 profile 이면 (실행한 스레드만 기록되므로) 한 스레드에서 차례로 실행"""
+
+    def __init__(self, groups, run, profile=None):
+        self._lock = threading.Lock()
+        self._cancel = threading.Event()
+        self._run = run
+        self.profile = profile if profile is not None else RunProfile()
+        self.progress = {group: GroupProgress(file_names, self._lock) for group, file_names in groups.items()}
+        self.results = {}
+        self._group_profiles = {group: RunProfile(kind=self.profile.kind) for group in groups}
+        self._thread = None
+
+    def start(self):
+        self._thread = threading.Thread(target=self._main, name='hakcompare-analysis', daemon=True)
+        self._thread.start()
+        return self
+
+    def _main(self):
+        groups = list(self.progress)
+        if self.profile.has_cprofile or len(groups) <= 1:
+            for group in groups:
+                self._run_group(group)
+        else:
+            with ThreadPoolExecutor(max_workers=len(groups), thread_name_prefix='hakcompare-group') as executor:
+                list(executor.map(self._run_group, groups))
+        for group in groups:
+            self.profile.records.extend(self._group_profiles[group].records)
+
+    def _run_group(self, group):
+        progress = self.progress[group]
+        with self._lock:
+            if self._cancel.is_set():
+                progress.state = 'cancelled'
+                return
+            progress.state = 'running'
+        try:
+            with self.profile.profiling():
+                result = self._run(group, progress, self._cancel, self._group_profiles[group])
+        except AnalysisCancelled:
+            state, error = 'cancelled', None
+        except Exception as e:  # 작업 스레드의 예외는 화면에서 표시
+            logger.exception("그룹 %s 분석 실패", group)
+            state, error = 'failed', str(e)
+        else:
+            state, error = 'done', None
+            self.results[group] = result
+        with self._lock:
+            progress.state, progress.error = state, error
+
+    def cancel(self):
+        """아직 시작하지 않은 파일 · 그룹은 건너뜀 (이미 파싱한 파일은 파싱 캐시에 남음)"""
+        self._cancel.set()
+
+    @property
+    def cancelled(self):
+        return self._cancel.is_set()
+
+    @property
+    def running(self):
+        return self._thread is not None and self._thread.is_alive()
+
+    def join(self, timeout=None):
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def snapshot(self):
+        """그룹별 진행 상황 {그룹: GroupProgress.snapshot()}"""
+        return {group: progress.snapshot() for group, progress in self.progress.items()}
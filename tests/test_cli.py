@@ -0,0 +1,46 @@
+"""일괄 처리 CLI 테스트 (합성 NEIS 내보내기 파일 사용)"""
+import os
+
+import pandas as pd
+import pytest
+
+from hakcompare_core.cli import main
+from benchmarks.generators import SentenceSource, generate_group
+
+def _write_group(directory, files):
+    os.makedirs(directory)
+    for file_name, file_bytes in files:
+        with open(os.path.join(directory, file_name), 'wb') as f:
+            f.write(file_bytes)
+    return str(directory)
+
+@pytest.fixture(scope='module')
+def group_dirs(tmp_path_factory):
+    """같은 문장 풀을 쓰는 두 학년 폴더 (학년 사이에도 복붙 문장이 있음)"""
+    base = tmp_path_factory.mktemp('groups')
+    source = SentenceSource(duplicate_rate=0.3, shared_pool=20, seed=1)
+    params = dict(classes=1, subjects=2, students=6, text_length=150, source=source)
+    return (
+        _write_group(base / '2학년', generate_group(grade=2, **params)),
+        _write_group(base / '3학년', generate_group(grade=3, **params)),
+    )
+
+@pytest.mark.filterwarnings('ignore::FutureWarning')
+def test_groups_two_dirs_cross_validate(group_dirs, tmp_path, capsys):
+    """--groups 로 두 그룹만 주어도 교차 검증 보고서와 시트를 만듦"""
+    output = tmp_path / 'reports'
+    assert main(['--groups', *group_dirs, '--output', str(output), '--workers', '1']) == 0
+    assert '여러 그룹 교차 검증 (2개 단위)' in capsys.readouterr().out
+
+    report = pd.read_excel(output / '생기부_여러그룹_교차검증결과.xlsx')
+    assert len(report) > 0
+    sheets = pd.read_excel(output / '생기부_전체_정리결과.xlsx', sheet_name=None)
+    assert {'2학년 정리결과', '3학년 정리결과', '여러 그룹 교차 검증', '그룹 간 공유 문장 수'} <= set(sheets)
+
+@pytest.mark.filterwarnings('ignore::FutureWarning')
+def test_group1_group2_cross_validate(group_dirs, tmp_path):
+    """--group1 / --group2 는 두 그룹 교차 검증 보고서를 만들고 여러 그룹 교차 검증은 하지 않음"""
+    output = tmp_path / 'reports'
+    assert main(['--group1', group_dirs[0], '--group2', group_dirs[1], '--output', str(output), '--workers', '1']) == 0
+    assert (output / '생기부_교차검증결과.xlsx').exists()
+    assert not (output / '생기부_여러그룹_교차검증결과.xlsx').exists()
@@ -0,0 +1,77 @@
+"""DuplicateIndex 의 파일 추가 / 제거 결과가 전체 재계산(analyze_duplicates)과 같은지 확인하는 무작위 테스트"""
+import random
+import warnings
+
+import pandas as pd
+import pytest
+
+from hakcompare_core.duplicates import analyze_duplicates, sentence_keys, _usage_by_sentence
+from hakcompare_core.incremental import DuplicateIndex
+from hakcompare_core.parsing import parse_file
+from hakcompare_core.pipeline import combine_parsed
+from benchmarks.generators import SentenceSource, generate_group
+
+STEPS = 40
+SENTENCE_KEY = ['유형', '과목/영역', '학년 반', '번호', '문장']
+
+@pytest.fixture(scope='module')
+def parsed_files():
+    """두 학년에 걸친 합성 파일들 (공용 문장 비율이 높아 파일을 넣고 뺄 때마다 중복 여부가 바뀜)"""
+    source = SentenceSource(duplicate_rate=0.4, shared_pool=30, seed=7)
+    files = []
+    for grade in (2, 3):
+        files += generate_group(classes=2, subjects=2, students=8, text_length=150, grade=grade, source=source)
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore', FutureWarning)
+        return {f"{i}_{name}": parse_file(name, data) for i, (name, data) in enumerate(files)}
+
+def _plain(df):
+    """범주형 열을 object 로 (범주 구성이 달라도 값만 비교)"""
+    return df.astype({col: object for col in df.columns if isinstance(df[col].dtype, pd.CategoricalDtype)})
+
+def _sorted(df):
+    return df.sort_values(list(df.columns), kind='stable').reset_index(drop=True)
+
+def _check(index, names, parsed):
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore', FutureWarning)
+        combined, _ = combine_parsed([(name, parsed[name].copy(), None) for name in names])
+        expected, expected_sentences = analyze_duplicates(combined)
+    result, sentences = index.result()
+
+    # 강조 색상은 색인이 문장 해시로 정하므로 값 대신 중복 행에만 있는지 확인
+    assert ((result['색상'] != '') == result['중복여부']).all()
+    columns = [col for col in expected.columns if col != '색상']
+    actual_rows, expected_rows = _plain(result[columns]), _plain(expected[columns])
+    for col in ('학기', '시수'):  # 파일마다 숫자 / 문자열이 달라 합친 뒤의 타입이 다를 수 있음
+        actual_rows[col], expected_rows[col] = actual_rows[col].astype(str), expected_rows[col].astype(str)
+    pd.testing.assert_frame_equal(_sorted(actual_rows), _sorted(expected_rows))
+    pd.testing.assert_frame_equal(
+        _sorted(_plain(sentences[SENTENCE_KEY])), _sorted(_plain(expected_sentences[SENTENCE_KEY])), check_dtype=False
+    )
+    # 문장 테이블의 행 번호가 결과 표의 그 문장이 나온 행을 가리킴
+    contents = result['내용'].astype(str).to_numpy()[sentences['행'].to_numpy()]
+    assert all(sentence in content for sentence, content in zip(sentences['문장'].astype(str), contents))
+
+    usage = _usage_by_sentence(expected_sentences)
+    keys = sentence_keys(usage).tolist()
+    assert [text for text, _ in index.usages(keys)] == usage['사용'].tolist()
+
+def test_add_remove_matches_full_analysis(parsed_files):
+    rng = random.Random(0)
+    index, names = DuplicateIndex(), []
+    for step in range(STEPS):
+        absent = [name for name in parsed_files if name not in names]
+        if names and (not absent or rng.random() < 0.4):
+            name = rng.choice(names)
+            index.remove_file(name)
+            names.remove(name)
+        else:
+            name = rng.choice(absent)
+            index.add_file(name, name, parsed_files[name])
+            names.append(name)
+        if names:
+            _check(index, names, parsed_files)
+        else:
+            assert index.result() == (None, None)
+    assert len(index) == len(names)